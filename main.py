@@ -1,22 +1,63 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from services.morph_service import calculate_score
-from services.oracle_service import submit_score_to_oracle, batch_submit_scores_to_oracle
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from services.clients import close_async_web3, close_http_client, get_http_client
+from services.morph_service import calculate_score_shared, get_score_model_version, warm_token_registry
+from services.batch_scoring import STREAM_BATCH_MAX_ADDRESSES, iter_batch_scores, score_batch
+from services.score_cache import score_cache
+from services.job_queue import job_queue, public_job_view
+from services.scoring_jobs import JOB_MAX_ADDRESSES, SCORE_JOB, register_scoring_jobs
+from services.relay_export import EXPORT_FORMATS, EXPORT_MODES, ORACLE_EXPORT_MAX_DEADLINE_MINUTES, ORACLE_EXPORT_MAX_VERSION, authenticate_relayer, export_relayers, iter_export_updates, iter_signed_export
+from services.oracle_service import oracle_service, submit_score_to_oracle, batch_submit_scores_to_oracle, get_oracle_transaction_status
+from services.ml_scoring_service import load_serving_model, serving_model_status
+import asyncio
+import json
 import logging
 import os
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Report ready only once a trained ML model is loaded; by default the rule-based
+# fallback is enough, since no compiled model ships with the repo
+MODEL_REQUIRED_FOR_READY = os.getenv("MODEL_REQUIRED_FOR_READY", "false").lower() == "true"
+
+# Set once startup has finished, cleared on shutdown
+app_started = False
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage shared resources for the lifetime of the application"""
+    global app_started
+    # Load the trained model once per worker (memory-mapped, so workers share it)
+    await asyncio.to_thread(load_serving_model)
+    # One pooled HTTP client for every explorer API call
+    get_http_client()
+    # Load immutable token metadata once instead of per score request
+    await warm_token_registry()
+    # Background workers for long scoring / oracle jobs
+    register_scoring_jobs(job_queue)
+    await job_queue.start()
+    app_started = True
+    yield
+    app_started = False
+    # Release pooled HTTP and RPC connections on shutdown
+    await job_queue.stop()
+    await oracle_service.close()
+    await score_cache.close()
+    await close_http_client()
+    await close_async_web3()
+
 # Create FastAPI app instance
 app = FastAPI(
     title="Credo Reputation API",
     description="API for calculating reputation scores based on blockchain activity",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow all origins
@@ -44,6 +85,17 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Backend API is running"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 once startup finished (and the ML model is loaded, if required)"""
+    ready = app_started and (serving_model_status["loaded"] or not MODEL_REQUIRED_FOR_READY)
+    content = {
+        "ready": ready,
+        "started": app_started,
+        "model": dict(serving_model_status)
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
 @app.get("/contract-status")
 async def contract_status():
     """Get smart contract deployment status"""
@@ -62,6 +114,32 @@ async def contract_status():
         "chain_id": 2810
     }
 
+@app.get("/oracle/tx/{tx_hash}")
+async def oracle_transaction_status(tx_hash: str):
+    """
+    Get the confirmation status of an oracle submission
+    
+    Args:
+        tx_hash: Transaction hash returned by a submission
+    
+    Returns:
+        Transaction status, block number and gas used once mined
+    """
+    if not tx_hash.startswith('0x') or len(tx_hash) != 66:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid transaction hash format"
+        )
+    
+    try:
+        return await get_oracle_transaction_status(tx_hash)
+    except Exception as e:
+        logger.error(f"Error looking up transaction {tx_hash}: {str(e)}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"Error looking up transaction: {str(e)}"
+        )
+
 @app.get("/score/{address}")
 async def get_reputation_score(address: str):
     """
@@ -83,10 +161,14 @@ async def get_reputation_score(address: str):
         
         logger.info(f"Calculating reputation score for address: {address}")
         
-        # Calculate the reputation score using the morph service
-        result = await calculate_score(address)
+        # Serve from the score cache, calculating via the morph service on a miss
+        result, cache_status = await score_cache.get_or_compute(
+            address,
+            get_score_model_version(),
+            lambda: calculate_score_shared(address)
+        )
         
-        logger.info(f"Successfully calculated score for {address}: {result['score']}")
+        logger.info(f"Successfully calculated score for {address}: {result['score']} (cache {cache_status})")
         
         return JSONResponse(
             status_code=200,
@@ -96,7 +178,8 @@ async def get_reputation_score(address: str):
                 "score": result["score"],
                 "metrics": result["metrics"],
                 "timestamp": result.get("timestamp")
-            }
+            },
+            headers={"X-Cache": cache_status.upper()}
         )
         
     except HTTPException:
@@ -113,10 +196,84 @@ async def get_reputation_score(address: str):
 class ScoreUpdateRequest(BaseModel):
     address: str
     submit_to_oracle: bool = False
+    background: bool = False  # Run as a background job and return its id
 
 class BatchScoreRequest(BaseModel):
     addresses: List[str]
     submit_to_oracle: bool = False
+    background: bool = False  # Run as a background job and return its id
+
+class JobRequest(BaseModel):
+    addresses: List[str]
+    submit_to_oracle: bool = False
+
+class SignedExportRequest(BaseModel):
+    addresses: List[str]  # Scored by this service, then signed
+    format: str = "jsonl"  # "jsonl" or "calldata"
+    mode: str = "single"  # "single" or "batch"
+    version: int = Field(2, ge=1, le=ORACLE_EXPORT_MAX_VERSION)
+    deadline_minutes: int = Field(60, ge=1, le=ORACLE_EXPORT_MAX_DEADLINE_MINUTES)
+
+class StreamBatchScoreRequest(BaseModel):
+    addresses: List[str]
+    format: str = "ndjson"  # "ndjson" or "sse"
+
+@app.post("/oracle/export")
+async def export_signed_updates(request: SignedExportRequest, x_relayer_key: Optional[str] = Header(None)):
+    """
+    Stream signed score updates for relayers to submit on-chain
+    
+    Only registered relayers (X-Relayer-Key header) may export, and only
+    scores computed here are signed. Each line is either a signed payload
+    ("jsonl") or a ready-to-send {"to", "data"} transaction ("calldata").
+    In batch mode the batch nonces belong to the relayer's registered
+    submitter account and batches must be sent in stream order.
+    
+    Args:
+        request: Addresses to score, plus export options
+        x_relayer_key: Relayer API key
+        
+    Returns:
+        NDJSON stream of signed updates
+    """
+    if not export_relayers:
+        raise HTTPException(status_code=503, detail="Relay export is not configured")
+    submitter = authenticate_relayer(x_relayer_key)
+    if submitter is None:
+        raise HTTPException(status_code=401, detail="Invalid or missing relayer key")
+    
+    if request.format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if request.mode not in EXPORT_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Use one of: {', '.join(EXPORT_MODES)}")
+    if not oracle_service.signing_pipeline:
+        raise HTTPException(status_code=503, detail="Oracle signing is not configured")
+    
+    if len(request.addresses) > STREAM_BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many addresses. Maximum {STREAM_BATCH_MAX_ADDRESSES} per request."
+        )
+    
+    # Validate all addresses
+    for addr in request.addresses:
+        if not addr.startswith('0x') or len(addr) != 42:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid address format: {addr}"
+            )
+    
+    logger.info(f"Exporting signed updates for {len(request.addresses)} users to relayer {submitter} ({request.mode}, {request.format})")
+    
+    lines = iter_signed_export(
+        iter_export_updates(request.addresses),
+        mode=request.mode,
+        fmt=request.format,
+        submitter=submitter,
+        version=request.version,
+        deadline_minutes=request.deadline_minutes
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"})
 
 @app.post("/submit-to-morph")
 async def submit_score_to_morph(request: ScoreUpdateRequest):
@@ -137,10 +294,13 @@ async def submit_score_to_morph(request: ScoreUpdateRequest):
                 detail="Invalid Ethereum address format"
             )
         
+        if request.background:
+            return await enqueue_score_job([request.address], request.submit_to_oracle)
+        
         logger.info(f"Calculating and updating score for address: {request.address}")
         
         # Calculate the score
-        result = await calculate_score(request.address)
+        result = await calculate_score_shared(request.address)
         
         response_data = {
             "success": True,
@@ -183,10 +343,12 @@ async def batch_update_scores(request: BatchScoreRequest):
         Batch processing results
     """
     try:
-        if len(request.addresses) > 50:
+        # Background jobs are not bound by the request timeout
+        max_addresses = JOB_MAX_ADDRESSES if request.background else 50
+        if len(request.addresses) > max_addresses:
             raise HTTPException(
                 status_code=400,
-                detail="Batch size too large. Maximum 50 addresses per request."
+                detail=f"Batch size too large. Maximum {max_addresses} addresses per request."
             )
         
         # Validate all addresses
@@ -197,41 +359,21 @@ async def batch_update_scores(request: BatchScoreRequest):
                     detail=f"Invalid address format: {addr}"
                 )
         
+        if request.background:
+            return await enqueue_score_job(request.addresses, request.submit_to_oracle)
+        
         logger.info(f"Batch processing {len(request.addresses)} addresses")
         
-        # Calculate scores for all addresses
-        results = []
-        oracle_updates = []
+        # Calculate scores for all addresses concurrently (results keep input order)
+        results = await score_batch(request.addresses)
         
-        for address in request.addresses:
-            try:
-                score_result = await calculate_score(address)
-                
-                result_data = {
-                    "address": address,
-                    "success": True,
-                    "score": score_result["score"],
-                    "metrics": score_result["metrics"],
-                    "timestamp": score_result.get("timestamp"),
-                    "version": score_result.get("version", "2.0")
-                }
-                
-                results.append(result_data)
-                
-                # Prepare for oracle submission if requested
-                if request.submit_to_oracle:
-                    oracle_updates.append({
-                        "user": address,
-                        "score": score_result["score"]
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error calculating score for {address}: {str(e)}")
-                results.append({
-                    "address": address,
-                    "success": False,
-                    "error": str(e)
-                })
+        # Prepare for oracle submission if requested
+        oracle_updates = []
+        if request.submit_to_oracle:
+            oracle_updates = [
+                {"user": r["address"], "score": r["score"]}
+                for r in results if r.get("success")
+            ]
         
         response_data = {
             "success": True,
@@ -256,6 +398,152 @@ async def batch_update_scores(request: BatchScoreRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
+async def enqueue_score_job(addresses: List[str], submit_to_oracle: bool) -> JSONResponse:
+    """Queue a background scoring job and return 202 with its id"""
+    job = await job_queue.submit(SCORE_JOB, {
+        "addresses": addresses,
+        "submit_to_oracle": submit_to_oracle
+    })
+    logger.info(f"Queued job {job['id']} for {len(addresses)} addresses")
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['id']}",
+        "events_url": f"/jobs/{job['id']}/events"
+    })
+
+@app.post("/jobs")
+async def create_job(request: JobRequest):
+    """
+    Queue a background job that scores addresses and optionally submits
+    the scores to the oracle
+    
+    Args:
+        request: Contains list of addresses and oracle submission flag
+        
+    Returns:
+        Job id and URLs to poll or stream its progress
+    """
+    if len(request.addresses) > JOB_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size too large. Maximum {JOB_MAX_ADDRESSES} addresses per job."
+        )
+    
+    # Validate all addresses
+    for addr in request.addresses:
+        if not addr.startswith('0x') or len(addr) != 42:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid address format: {addr}"
+            )
+    
+    return await enqueue_score_job(request.addresses, request.submit_to_oracle)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status, progress and (once finished) result of a job
+    
+    Args:
+        job_id: Id returned when the job was queued
+        
+    Returns:
+        Job record
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return public_job_view(job)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream a job's progress as Server-Sent Events until it finishes
+    
+    Args:
+        job_id: Id returned when the job was queued
+        
+    Returns:
+        Event stream of job records
+    """
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    async def generate():
+        async for job in job_queue.watch(job_id):
+            view = public_job_view(job)
+            # The full result is only sent once, with the final event
+            if job["status"] not in ("succeeded", "failed"):
+                view.pop("result")
+            yield f"event: {job['status']}\ndata: {json.dumps(view)}\n\n"
+    
+    return StreamingResponse(generate(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/score/batch/stream")
+async def stream_batch_scores(request: StreamBatchScoreRequest):
+    """
+    Calculate scores for a large list of addresses, streaming each result
+    
+    Results are emitted in completion order as soon as they are ready, either
+    as NDJSON lines or as Server-Sent Events. Every result carries the
+    "index" of its address in the request. A final summary record closes
+    the stream.
+    
+    Args:
+        request: Contains list of addresses and the stream format
+        
+    Returns:
+        Streaming response of per-address results
+    """
+    if request.format not in ("ndjson", "sse"):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid format. Use 'ndjson' or 'sse'."
+        )
+    
+    if len(request.addresses) > STREAM_BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size too large. Maximum {STREAM_BATCH_MAX_ADDRESSES} addresses per request."
+        )
+    
+    # Validate all addresses
+    for addr in request.addresses:
+        if not addr.startswith('0x') or len(addr) != 42:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid address format: {addr}"
+            )
+    
+    logger.info(f"Streaming batch of {len(request.addresses)} addresses as {request.format}")
+    
+    def encode(event: str, payload: dict) -> str:
+        if request.format == "sse":
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps(payload) + "\n"
+    
+    async def generate():
+        successful = 0
+        results = iter_batch_scores(request.addresses)
+        try:
+            async for result in results:
+                if result.get("success"):
+                    successful += 1
+                yield encode("result", result)
+        finally:
+            await results.aclose()
+        
+        yield encode("summary", {
+            "summary": True,
+            "total_addresses": len(request.addresses),
+            "successful_calculations": successful
+        })
+    
+    media_type = "text/event-stream" if request.format == "sse" else "application/x-ndjson"
+    return StreamingResponse(generate(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -0,0 +1,75 @@
+"""
+Per-request address snapshot
+Fetches each on-chain primitive for an address once, pinned to a single block
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from web3 import AsyncWeb3, Web3
+
+logger = logging.getLogger(__name__)
+
+
+class AddressSnapshot:
+    """
+    Shared view of an address at one block for the duration of a score request
+
+    Every primitive (balance, nonce, ...) is requested at most once; concurrent
+    callers await the same in-flight RPC call. All reads use the pinned block
+    number so metrics computed by different coroutines are consistent.
+    """
+
+    def __init__(self, aw3: AsyncWeb3, address: str, block_number: int):
+        self.aw3 = aw3
+        self.address = Web3.to_checksum_address(address)
+        self.block_number = block_number
+        self._values: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    async def create(cls, aw3: AsyncWeb3, address: str) -> "AddressSnapshot":
+        """
+        Create a snapshot pinned to the current head block
+
+        Args:
+            aw3: Async Web3 instance for the chain
+            address: Wallet address to snapshot
+
+        Returns:
+            AddressSnapshot instance
+        """
+        block_number = await aw3.eth.block_number
+        return cls(aw3, address, block_number)
+
+    async def memoize(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory once per key and share its result with every caller"""
+        future = self._values.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._values[key] = future
+        return await asyncio.shield(future)
+
+    async def get_balance(self) -> int:
+        """ETH balance in wei at the pinned block"""
+        return await self.memoize(
+            "balance",
+            lambda: self.aw3.eth.get_balance(self.address, block_identifier=self.block_number)
+        )
+
+    async def get_transaction_count(self) -> int:
+        """Account nonce at the pinned block"""
+        return await self.memoize(
+            "transaction_count",
+            lambda: self.aw3.eth.get_transaction_count(self.address, block_identifier=self.block_number)
+        )
+
+    async def get_eth_balance(self) -> float:
+        """ETH balance in ether at the pinned block"""
+        return float(Web3.from_wei(await self.get_balance(), 'ether'))
+
+    def cancel(self):
+        """Cancel any lookups that are still in flight"""
+        for future in self._values.values():
+            if not future.done():
+                future.cancel()
@@ -0,0 +1,214 @@
+"""
+Batch scoring for multiple wallet addresses
+Metrics are collected concurrently under a semaphore with a per-address
+timeout, so a batch takes about as long as its slowest address, and the
+whole batch is then scored with one vectorized model inference. Large
+batches can be streamed result by result instead of buffered
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .morph_service import (
+    calculate_score_shared,
+    collect_score_metrics_shared,
+    get_demo_score_data,
+    score_error_result,
+    score_metrics_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of addresses scored at the same time
+BATCH_SCORE_CONCURRENCY = int(os.getenv("BATCH_SCORE_CONCURRENCY", "10"))
+# Time limit for scoring a single address within a batch
+BATCH_SCORE_TIMEOUT_SECONDS = float(os.getenv("BATCH_SCORE_TIMEOUT_SECONDS", "30"))
+# Maximum number of addresses accepted by a streaming batch request
+STREAM_BATCH_MAX_ADDRESSES = int(os.getenv("STREAM_BATCH_MAX_ADDRESSES", "10000"))
+
+
+async def score_address(
+    address: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float = BATCH_SCORE_TIMEOUT_SECONDS
+) -> Dict[str, Any]:
+    """
+    Score one address of a batch, isolating any failure to that address
+
+    Args:
+        address: Wallet address to score
+        semaphore: Semaphore bounding concurrent score calculations
+        timeout: Seconds allowed for this address
+
+    Returns:
+        Per-address result entry with a success flag
+    """
+    async with semaphore:
+        try:
+            score_result = await asyncio.wait_for(calculate_score_shared(address), timeout)
+            return _result_entry(address, score_result)
+
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out calculating score for {address} after {timeout}s")
+            return _timeout_entry(address, timeout)
+        except Exception as e:
+            logger.error(f"Error calculating score for {address}: {str(e)}")
+            return _error_entry(address, e)
+
+
+def _result_entry(address: str, score_result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "address": address,
+        "success": True,
+        "score": score_result["score"],
+        "metrics": score_result["metrics"],
+        "timestamp": score_result.get("timestamp"),
+        "version": score_result.get("version", "2.0")
+    }
+
+
+def _timeout_entry(address: str, timeout: float) -> Dict[str, Any]:
+    return {
+        "address": address,
+        "success": False,
+        "error": f"Score calculation timed out after {timeout} seconds"
+    }
+
+
+def _error_entry(address: str, error: Exception) -> Dict[str, Any]:
+    return {
+        "address": address,
+        "success": False,
+        "error": str(error)
+    }
+
+
+async def _score_row(address: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Score one collected row on its own, failing like calculate_score does"""
+    try:
+        return (await score_metrics_batch([metrics]))[0]
+    except Exception as e:
+        logger.error(f"Error scoring {address}: {str(e)}")
+        return score_error_result(e)
+
+
+async def collect_address_metrics(
+    address: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float = BATCH_SCORE_TIMEOUT_SECONDS
+) -> Dict[str, Any]:
+    """
+    Collect the metrics of one address of a batch without scoring it
+
+    Args:
+        address: Wallet address to analyze
+        semaphore: Semaphore bounding concurrent metric collections
+        timeout: Seconds allowed for this address
+
+    Returns:
+        {"address", "metrics"} to be scored, or a finished result entry
+        (demo wallets, timeouts and errors)
+    """
+    async with semaphore:
+        try:
+            metrics = await asyncio.wait_for(collect_score_metrics_shared(address), timeout)
+            if metrics is None:
+                return _result_entry(address, await get_demo_score_data(address))
+            return {"address": address, "metrics": metrics}
+
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out collecting metrics for {address} after {timeout}s")
+            return _timeout_entry(address, timeout)
+        except Exception as e:
+            logger.error(f"Error collecting metrics for {address}: {str(e)}")
+            return _error_entry(address, e)
+
+
+async def score_batch(
+    addresses: List[str],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score a list of addresses with bounded concurrency
+
+    Metrics for all addresses are collected first, then every collected row
+    is scored in a single model inference instead of once per address. If
+    that inference fails, the rows are scored one by one so only the
+    offending addresses fail.
+
+    Args:
+        addresses: Wallet addresses to score
+        concurrency: Maximum concurrent calculations (defaults to BATCH_SCORE_CONCURRENCY)
+        timeout: Per-address time limit in seconds (defaults to BATCH_SCORE_TIMEOUT_SECONDS)
+
+    Returns:
+        One result entry per address, in input order
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or BATCH_SCORE_CONCURRENCY))
+    timeout = timeout or BATCH_SCORE_TIMEOUT_SECONDS
+
+    entries = await asyncio.gather(*(
+        collect_address_metrics(address, semaphore, timeout) for address in addresses
+    ))
+
+    to_score = [i for i, entry in enumerate(entries) if "success" not in entry]
+    try:
+        score_results = await score_metrics_batch([entries[i]["metrics"] for i in to_score])
+        for i, score_result in zip(to_score, score_results):
+            entries[i] = _result_entry(entries[i]["address"], score_result)
+    except Exception as e:
+        logger.error(f"Error scoring batch of {len(to_score)} addresses, scoring them one by one: {str(e)}")
+        score_results = await asyncio.gather(*(
+            _score_row(entries[i]["address"], entries[i]["metrics"]) for i in to_score
+        ))
+        for i, score_result in zip(to_score, score_results):
+            entries[i] = _result_entry(entries[i]["address"], score_result)
+
+    return entries
+
+
+async def iter_batch_scores(
+    addresses: List[str],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Score addresses concurrently and yield each result as soon as it is ready
+
+    A fixed pool of workers pulls addresses and pushes results into a bounded
+    queue. When the consumer falls behind, the queue fills up and the workers
+    pause, so at most a few results are held in memory at any time. Closing
+    the generator early (e.g. a disconnected client) stops the workers.
+
+    Args:
+        addresses: Wallet addresses to score
+        concurrency: Number of workers (defaults to BATCH_SCORE_CONCURRENCY)
+        timeout: Per-address time limit in seconds (defaults to BATCH_SCORE_TIMEOUT_SECONDS)
+
+    Yields:
+        Per-address result entries in completion order, each with its input "index"
+    """
+    concurrency = max(1, concurrency or BATCH_SCORE_CONCURRENCY)
+    timeout = timeout or BATCH_SCORE_TIMEOUT_SECONDS
+    # The semaphore never blocks here; the worker count is the bound
+    semaphore = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    pending = iter(enumerate(addresses))
+
+    async def worker():
+        for index, address in pending:
+            result = await score_address(address, semaphore, timeout)
+            await results.put({"index": index, **result})
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(addresses)))]
+
+    try:
+        for _ in range(len(addresses)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,136 @@
+"""
+Shared network clients for the Credo API
+Owns the pooled async Web3 providers and the HTTP client used by the scoring
+and oracle services
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+import httpx
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncWeb3, AsyncHTTPProvider
+
+logger = logging.getLogger(__name__)
+
+# Connection pool configuration for JSON-RPC traffic
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "100"))
+RPC_POOL_SIZE_PER_HOST = int(os.getenv("RPC_POOL_SIZE_PER_HOST", "0"))  # 0 = unlimited
+RPC_TIMEOUT_SECONDS = float(os.getenv("RPC_TIMEOUT_SECONDS", "30"))
+
+# Connection pool configuration for explorer/API traffic (Etherscan etc.)
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "45"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+
+_http_client: Optional[httpx.AsyncClient] = None
+_async_web3: Dict[str, AsyncWeb3] = {}
+_rpc_sessions: Dict[str, ClientSession] = {}
+_rpc_lock: Optional[asyncio.Lock] = None
+
+
+def _get_rpc_lock() -> asyncio.Lock:
+    """Create the provider lock lazily so it binds to the running event loop"""
+    global _rpc_lock
+    if _rpc_lock is None:
+        _rpc_lock = asyncio.Lock()
+    return _rpc_lock
+
+
+async def get_async_web3(rpc_url: str) -> AsyncWeb3:
+    """
+    Get the shared AsyncWeb3 instance for an RPC endpoint
+
+    The first call for an endpoint creates a pooled aiohttp session that is
+    reused by every subsequent request, so concurrent coroutines share
+    keep-alive connections instead of blocking the event loop.
+
+    Args:
+        rpc_url: JSON-RPC endpoint URL
+
+    Returns:
+        AsyncWeb3 instance bound to a pooled HTTP session
+    """
+    aw3 = _async_web3.get(rpc_url)
+    if aw3 is not None:
+        return aw3
+
+    async with _get_rpc_lock():
+        aw3 = _async_web3.get(rpc_url)
+        if aw3 is not None:
+            return aw3
+
+        session = ClientSession(
+            connector=TCPConnector(limit=RPC_POOL_SIZE, limit_per_host=RPC_POOL_SIZE_PER_HOST),
+            timeout=ClientTimeout(total=RPC_TIMEOUT_SECONDS)
+        )
+        provider = AsyncHTTPProvider(rpc_url)
+        await provider.cache_async_session(session)
+
+        aw3 = AsyncWeb3(provider)
+        _rpc_sessions[rpc_url] = session
+        _async_web3[rpc_url] = aw3
+        logger.info(f"Async Web3 provider initialized (pool size {RPC_POOL_SIZE})")
+        return aw3
+
+
+async def close_async_web3():
+    """Close every pooled RPC session (called on application shutdown)"""
+    sessions = list(_rpc_sessions.values())
+    _rpc_sessions.clear()
+    _async_web3.clear()
+
+    for session in sessions:
+        try:
+            await session.close()
+        except Exception as e:
+            logger.warning(f"Error closing RPC session: {str(e)}")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the application lifetime
+
+    Connections (and TLS sessions) are kept alive and reused across score
+    requests instead of paying a new handshake per request.
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        http2 = HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+        logger.info(f"HTTP client initialized (http2={http2}, max connections {HTTP_MAX_CONNECTIONS})")
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (called on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        client = _http_client
+        _http_client = None
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {str(e)}")
@@ -0,0 +1,240 @@
+"""
+Compiled ML ensemble for serving
+The trained random forest, gradient boosting model and scaler are flattened
+into plain NumPy node arrays and scored by a small vectorized tree
+evaluator, so serving needs neither sklearn nor joblib
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .feature_pipeline import FEATURE_COLUMNS, FEATURE_SET_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+COMPILED_MODEL_FORMAT_VERSION = 1
+# Rows scored per evaluation pass (bounds the (rows x trees) node index matrix)
+COMPILED_MODEL_ROW_CHUNK = int(os.getenv("COMPILED_MODEL_ROW_CHUNK", "4096"))
+
+MANIFEST_FILE = "manifest.json"
+TREE_ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+
+def flatten_trees(trees: List[Any]) -> Dict[str, np.ndarray]:
+    """
+    Concatenate fitted sklearn regression trees into flat node arrays
+
+    Node indices are global across all trees and the children of node i are
+    stored at children[2 * i] (left) and children[2 * i + 1] (right). Leaves
+    point to themselves and split on feature 0, so a fixed number of descent
+    steps leaves every row on its leaf without branching on leaf status.
+
+    Args:
+        trees: Fitted DecisionTreeRegressor objects
+
+    Returns:
+        Dict of feature, threshold, children, value and roots arrays,
+        plus the maximum tree depth
+    """
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for tree in trees:
+        t = tree.tree_
+        node_ids = np.arange(t.node_count, dtype=np.int32)
+        is_leaf = t.children_left == -1
+
+        features.append(np.where(is_leaf, 0, t.feature).astype(np.int32))
+        thresholds.append(np.where(is_leaf, 0.0, t.threshold).astype(np.float64))
+        left = np.where(is_leaf, node_ids, t.children_left) + offset
+        right = np.where(is_leaf, node_ids, t.children_right) + offset
+        children.append(np.stack([left, right], axis=1).ravel().astype(np.int32))
+        values.append(t.value[:, 0, 0].astype(np.float64))
+        roots.append(offset)
+
+        offset += t.node_count
+        max_depth = max(max_depth, int(t.max_depth))
+
+    return {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "children": np.concatenate(children),
+        "value": np.concatenate(values),
+        "roots": np.array(roots, dtype=np.int32),
+        "depth": max_depth
+    }
+
+
+def evaluate_trees(trees: Dict[str, np.ndarray], depth: int, X: np.ndarray) -> np.ndarray:
+    """
+    Leaf values of every tree for every row
+
+    Args:
+        trees: Arrays produced by flatten_trees
+        depth: Maximum tree depth
+        X: Feature matrix (n_rows, n_features)
+
+    Returns:
+        Array of shape (n_rows, n_trees)
+    """
+    # sklearn compares float32 inputs against float64 thresholds
+    X32 = np.ascontiguousarray(X, dtype=np.float32)
+    flat = X32.ravel()
+    row_offsets = (np.arange(len(X32)) * X32.shape[1])[:, None]
+    feature, threshold, children = trees["feature"], trees["threshold"], trees["children"]
+    nodes = np.broadcast_to(trees["roots"], (len(X32), len(trees["roots"]))).copy()
+
+    for _ in range(depth):
+        go_left = flat[row_offsets + feature[nodes]] <= threshold[nodes]
+        nodes = children[2 * nodes + 1 - go_left]
+
+    return trees["value"][nodes]
+
+
+def export_compiled_model(scorer: Any, path: str) -> str:
+    """
+    Write a trained MLCredoScorer as a compiled model directory
+
+    Args:
+        scorer: Trained MLCredoScorer
+        path: Output directory (created if missing)
+
+    Returns:
+        The output directory
+    """
+    if not scorer.is_trained:
+        raise ValueError("Cannot export untrained models")
+
+    rf = scorer.models['rf']
+    gb = scorer.models['gb']
+    scaler = scorer.scalers['standard']
+
+    rf_trees = flatten_trees(rf.estimators_)
+    gb_trees = flatten_trees([stage[0] for stage in gb.estimators_])
+
+    # DummyRegressor(strategy="mean") by default; init="zero" has no constant
+    init = getattr(gb.init_, "constant_", 0.0)
+
+    os.makedirs(path, exist_ok=True)
+    for prefix, trees in (("rf", rf_trees), ("gb", gb_trees)):
+        for name in TREE_ARRAYS:
+            np.save(os.path.join(path, f"{prefix}_{name}.npy"), trees[name])
+
+    n_features = len(FEATURE_COLUMNS)
+    mean = scaler.mean_ if getattr(scaler, "mean_", None) is not None else np.zeros(n_features)
+    scale = scaler.scale_ if getattr(scaler, "scale_", None) is not None else np.ones(n_features)
+    np.save(os.path.join(path, "scaler_mean.npy"), np.asarray(mean, dtype=np.float64))
+    np.save(os.path.join(path, "scaler_scale.npy"), np.asarray(scale, dtype=np.float64))
+
+    manifest = {
+        "format_version": COMPILED_MODEL_FORMAT_VERSION,
+        "model_version": scorer.model_version,
+        "feature_set_version": FEATURE_SET_VERSION,
+        "feature_columns": list(FEATURE_COLUMNS),
+        "rf_depth": rf_trees["depth"],
+        "gb_depth": gb_trees["depth"],
+        "gb_learning_rate": float(gb.learning_rate),
+        "gb_init": float(np.ravel(init)[0]),
+        "feature_importance": {
+            name: {column: float(weight) for column, weight in importance.items()}
+            for name, importance in scorer.feature_importance.items()
+        }
+    }
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    logger.info(
+        f"Compiled model {scorer.model_version} exported to {path} "
+        f"({len(rf_trees['roots'])} forest trees, {len(gb_trees['roots'])} boosting stages)"
+    )
+    return path
+
+
+class CompiledEnsemble:
+    """
+    Serves the RF + GB ensemble from compiled node arrays
+
+    Produces the same predictions as the sklearn models it was exported from.
+    """
+
+    def __init__(self, manifest: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.manifest = manifest
+        self.model_version = manifest["model_version"]
+        self.feature_columns = manifest["feature_columns"]
+        self.feature_importance = manifest.get("feature_importance", {})
+        self._rf = {name: arrays[f"rf_{name}"] for name in TREE_ARRAYS}
+        self._gb = {name: arrays[f"gb_{name}"] for name in TREE_ARRAYS}
+        self._scaler_mean = arrays["scaler_mean"]
+        self._scaler_scale = arrays["scaler_scale"]
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = None) -> "CompiledEnsemble":
+        """
+        Load a compiled model directory
+
+        Args:
+            path: Directory written by export_compiled_model
+            mmap_mode: Passed to np.load (e.g. "r" to memory-map the arrays)
+
+        Returns:
+            CompiledEnsemble
+        """
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != COMPILED_MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {manifest.get('format_version')}")
+
+        names = [f"{prefix}_{name}" for prefix in ("rf", "gb") for name in TREE_ARRAYS]
+        names += ["scaler_mean", "scaler_scale"]
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in names}
+        return cls(manifest, arrays)
+
+    def predict_batch(self, X: np.ndarray) -> Dict[str, Any]:
+        """
+        Predict credit scores for a feature matrix
+
+        Args:
+            X: Feature matrix of shape (n, len(feature_columns))
+
+        Returns:
+            Same format as MLCredoScorer.predict_batch
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_columns):
+            raise ValueError(f"Expected a feature matrix with {len(self.feature_columns)} columns, got shape {X.shape}")
+
+        rf_pred = np.empty(len(X))
+        gb_pred = np.empty(len(X))
+        learning_rate = self.manifest["gb_learning_rate"]
+
+        for start in range(0, len(X), COMPILED_MODEL_ROW_CHUNK):
+            chunk = X[start:start + COMPILED_MODEL_ROW_CHUNK]
+            stop = start + len(chunk)
+
+            rf_pred[start:stop] = evaluate_trees(self._rf, self.manifest["rf_depth"], chunk).mean(axis=1)
+
+            scaled = (chunk - self._scaler_mean) / self._scaler_scale
+            gb_values = evaluate_trees(self._gb, self.manifest["gb_depth"], scaled)
+            gb_pred[start:stop] = self.manifest["gb_init"] + learning_rate * gb_values.sum(axis=1)
+
+        rf_pred = np.clip(rf_pred, 0, 1000)
+        gb_pred = np.clip(gb_pred, 0, 1000)
+
+        # Same weighting and confidence as MLCredoScorer.predict_batch
+        ensemble_score = rf_pred * 0.6 + gb_pred * 0.4
+        confidence = np.maximum(0.5, 1 - np.abs(rf_pred - gb_pred) / 1000)
+
+        return {
+            'ensemble_score': ensemble_score.astype(np.int64),
+            'random_forest': rf_pred,
+            'gradient_boosting': gb_pred,
+            'confidence': confidence,
+            'model_type': 'ml_ensemble'
+        }
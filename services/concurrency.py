@@ -0,0 +1,95 @@
+"""
+Async concurrency primitives shared by the Credo services
+Token-bucket rate limiting and single-flight request coalescing
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio code
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    acquire() consumes one token, sleeping until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_available(self) -> float:
+        """Seconds until a token can be consumed (0 if one is available now)"""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Consume a token if one is available without waiting"""
+        if self.time_until_available() == 0:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self):
+        """Wait for and consume one token"""
+        while not self.try_acquire():
+            await asyncio.sleep(self.time_until_available())
+
+    def penalize(self, seconds: float):
+        """Drain the bucket so no token is available for the given time"""
+        self._refill()
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight execution
+
+    The first caller for a key starts the work; callers arriving while it is
+    running await the same result. Once it finishes the key is released, so
+    later calls start a fresh execution.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() once for all concurrent callers with the same key
+
+        Args:
+            key: Hashable identity of the work
+            factory: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            Result of the shared execution (exceptions propagate to every caller)
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+
+        # Shield so one cancelled caller does not cancel the shared work
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the exception as retrieved if every caller went away
+        if not future.cancelled():
+            future.exception()
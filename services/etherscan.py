@@ -0,0 +1,117 @@
+"""
+Rate-limited Etherscan API access
+Every request goes through a per-key token bucket and identical concurrent
+requests are coalesced into one HTTP call
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .concurrency import SingleFlight, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+ETHERSCAN_API_BASE = "https://api.etherscan.io/api"
+
+# Calls per second allowed for each API key (free tier is 5/s)
+ETHERSCAN_CALLS_PER_SECOND = float(os.getenv("ETHERSCAN_CALLS_PER_SECOND", "5"))
+# Retries when Etherscan still reports a rate-limit error
+ETHERSCAN_MAX_RETRIES = int(os.getenv("ETHERSCAN_MAX_RETRIES", "3"))
+
+
+def get_etherscan_api_keys() -> List[str]:
+    """Get configured API keys (ETHERSCAN_API_KEYS, comma-separated, or ETHERSCAN_API_KEY)"""
+    keys = [key.strip() for key in os.getenv("ETHERSCAN_API_KEYS", "").split(",") if key.strip()]
+    if not keys:
+        keys = [os.getenv("ETHERSCAN_API_KEY", "")]
+    return keys
+
+
+def _is_rate_limited(data: Dict[str, Any]) -> bool:
+    """Check whether an Etherscan response is a rate-limit rejection"""
+    if data.get("status") == "1":
+        return False
+    result = str(data.get("result", "")).lower()
+    return "rate limit" in result
+
+
+class EtherscanClient:
+    """
+    Etherscan client with key rotation, rate limiting and request coalescing
+
+    Each API key has its own token bucket; a request uses whichever key can
+    serve it soonest. Concurrent requests with identical parameters share a
+    single in-flight HTTP call.
+    """
+
+    def __init__(self, api_keys: List[str], calls_per_second: float, base_url: str = ETHERSCAN_API_BASE):
+        self.base_url = base_url
+        self.api_keys = api_keys
+        self._buckets = {key: TokenBucket(calls_per_second) for key in api_keys}
+        self._inflight = SingleFlight()
+
+    async def _acquire_key(self) -> str:
+        """Wait until some API key has budget and return it"""
+        while True:
+            waits = {key: bucket.time_until_available() for key, bucket in self._buckets.items()}
+            key = min(waits, key=waits.get)
+            if self._buckets[key].try_acquire():
+                return key
+            await asyncio.sleep(waits[key])
+
+    async def get(self, client: httpx.AsyncClient, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Perform a GET request against the Etherscan API
+
+        Args:
+            client: HTTP client for making requests
+            params: Query parameters (without apikey)
+
+        Returns:
+            Decoded JSON response, or None if the HTTP request failed
+        """
+        params = {k: v for k, v in params.items() if k != "apikey"}
+        coalesce_key = tuple(sorted((k, str(v)) for k, v in params.items()))
+        return await self._inflight.do(coalesce_key, lambda: self._request(client, params))
+
+    async def _request(self, client: httpx.AsyncClient, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        data = None
+        for attempt in range(ETHERSCAN_MAX_RETRIES + 1):
+            key = await self._acquire_key()
+            response = await client.get(self.base_url, params={**params, "apikey": key})
+
+            if response.status_code != 200:
+                logger.warning(f"Etherscan returned HTTP {response.status_code} for {params.get('action')}")
+                return None
+
+            data = response.json()
+            if not _is_rate_limited(data):
+                return data
+
+            # Back this key off for a second and try again with the next one
+            logger.warning(f"Etherscan rate limit hit (attempt {attempt + 1}), backing off")
+            self._buckets[key].penalize(1.0)
+
+        return data
+
+
+# Global Etherscan client shared by all scoring requests
+etherscan_client = EtherscanClient(get_etherscan_api_keys(), ETHERSCAN_CALLS_PER_SECOND)
+
+
+async def etherscan_get(client: httpx.AsyncClient, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convenience function for a rate-limited, coalesced Etherscan request
+
+    Args:
+        client: HTTP client for making requests
+        params: Query parameters (without apikey)
+
+    Returns:
+        Decoded JSON response, or None if the HTTP request failed
+    """
+    return await etherscan_client.get(client, params)
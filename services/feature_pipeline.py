@@ -0,0 +1,204 @@
+"""
+Feature pipeline shared by ML training and serving
+The single definition of the Credo model features: a columnar path over
+NumPy arrays, pandas/Arrow batches or lists of metric dicts, and a scalar
+path for single requests. Both produce columns in FEATURE_COLUMNS order
+"""
+
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+
+# Bump whenever a feature is added, removed, reordered or redefined; models
+# record the version they were trained with and refuse other versions
+FEATURE_SET_VERSION = 1
+
+# Basic wallet metrics the features are derived from
+BASE_METRICS = [
+    'wallet_age_days',
+    'transaction_count',
+    'eth_balance',
+    'liquidation_count',
+    'stablecoin_percentage',
+    'balance_stability_score',
+    'total_portfolio_value_usd'
+]
+
+# Fixed feature order used for model training and inference
+FEATURE_COLUMNS = BASE_METRICS + [
+    'tx_per_day',
+    'value_per_day',
+    'liquidation_rate',
+    'portfolio_concentration',
+    'eth_dominance',
+    'log_portfolio_value',
+    'is_whale',
+    'is_active_trader',
+    'is_hodler',
+    'stability_age_ratio',
+    'diversification_score'
+]
+
+
+def _base_columns(batch: Any) -> Dict[str, np.ndarray]:
+    """Basic metric columns of a batch as float64 arrays (missing metrics are 0)"""
+    columns = {}
+    for name in BASE_METRICS:
+        try:
+            # Arrow chunked arrays and pandas series both convert through np.asarray
+            columns[name] = np.asarray(batch[name], dtype=np.float64)
+        except KeyError:
+            columns[name] = None
+    n_rows = next((len(column) for column in columns.values() if column is not None), 0)
+    return {name: np.zeros(n_rows) if column is None else column for name, column in columns.items()}
+
+
+def compute_feature_matrix(metrics: Any) -> np.ndarray:
+    """
+    Compute model features column-wise
+
+    Args:
+        metrics: Columnar batch of basic metrics - a dict of arrays, a pandas
+            DataFrame or a pyarrow Table/RecordBatch
+
+    Returns:
+        Feature matrix of shape (n, len(FEATURE_COLUMNS)) in FEATURE_COLUMNS order
+    """
+    base = _base_columns(metrics)
+    age = base['wallet_age_days']
+    tx_count = base['transaction_count']
+    eth_balance = base['eth_balance']
+    liquidations = base['liquidation_count']
+    stablecoin_pct = base['stablecoin_percentage']
+    stability = base['balance_stability_score']
+    portfolio = base['total_portfolio_value_usd']
+
+    # Activity ratios (0 for wallets without age)
+    has_age = age > 0
+    safe_age = np.where(has_age, age, 1.0)
+    tx_per_day = np.where(has_age, tx_count / safe_age, 0.0)
+    value_per_day = np.where(has_age, portfolio / safe_age, 0.0)
+
+    columns = {
+        'wallet_age_days': age,
+        'transaction_count': tx_count,
+        'eth_balance': eth_balance,
+        'liquidation_count': liquidations,
+        'stablecoin_percentage': stablecoin_pct,
+        'balance_stability_score': stability,
+        'total_portfolio_value_usd': portfolio,
+        'tx_per_day': tx_per_day,
+        'value_per_day': value_per_day,
+        # Risk indicators
+        'liquidation_rate': liquidations / np.maximum(1, tx_count),
+        'portfolio_concentration': 100 - stablecoin_pct,  # Higher = more concentrated in volatile assets
+        # Wealth indicators
+        'eth_dominance': (eth_balance * 2000) / np.maximum(1, portfolio) * 100,
+        'log_portfolio_value': np.log1p(portfolio),
+        # Behavioral patterns
+        'is_whale': (portfolio > 100000).astype(np.float64),
+        'is_active_trader': (tx_per_day > 1.0).astype(np.float64),
+        'is_hodler': ((tx_per_day < 0.1) & (age > 365)).astype(np.float64),
+        # Stability metrics
+        'stability_age_ratio': stability * age / 365,
+        'diversification_score': np.minimum(stablecoin_pct, 100 - stablecoin_pct)
+    }
+    return np.column_stack([columns[name] for name in FEATURE_COLUMNS])
+
+
+def metrics_to_matrix(metrics_list: List[Mapping[str, Any]]) -> np.ndarray:
+    """
+    Compute model features for a list of per-wallet metric dicts
+
+    Args:
+        metrics_list: Basic metrics, one dict per wallet
+
+    Returns:
+        Feature matrix in FEATURE_COLUMNS order
+    """
+    columns = {
+        name: np.array([float(metrics.get(name, 0)) for metrics in metrics_list], dtype=np.float64)
+        for name in BASE_METRICS
+    }
+    return compute_feature_matrix(columns)
+
+
+def extract_feature_vector(metrics: Mapping[str, Any]) -> List[float]:
+    """
+    Compute model features for one wallet without NumPy overhead
+
+    Args:
+        metrics: Basic metrics of the wallet
+
+    Returns:
+        Feature values in FEATURE_COLUMNS order (same values as compute_feature_matrix)
+    """
+    age = float(metrics.get('wallet_age_days', 0))
+    tx_count = float(metrics.get('transaction_count', 0))
+    eth_balance = float(metrics.get('eth_balance', 0))
+    liquidations = float(metrics.get('liquidation_count', 0))
+    stablecoin_pct = float(metrics.get('stablecoin_percentage', 0))
+    stability = float(metrics.get('balance_stability_score', 0))
+    portfolio = float(metrics.get('total_portfolio_value_usd', 0))
+
+    tx_per_day = tx_count / age if age > 0 else 0.0
+    value_per_day = portfolio / age if age > 0 else 0.0
+
+    return [
+        age,
+        tx_count,
+        eth_balance,
+        liquidations,
+        stablecoin_pct,
+        stability,
+        portfolio,
+        tx_per_day,
+        value_per_day,
+        liquidations / max(1.0, tx_count),
+        100 - stablecoin_pct,
+        (eth_balance * 2000) / max(1.0, portfolio) * 100,
+        # NumPy's log1p, so both paths agree bit for bit
+        float(np.log1p(portfolio)),
+        1.0 if portfolio > 100000 else 0.0,
+        1.0 if tx_per_day > 1.0 else 0.0,
+        1.0 if tx_per_day < 0.1 and age > 365 else 0.0,
+        stability * age / 365,
+        min(stablecoin_pct, 100 - stablecoin_pct)
+    ]
+
+
+def extract_feature_dict(metrics: Mapping[str, Any]) -> Dict[str, float]:
+    """Scalar path returning a feature name -> value dictionary"""
+    return dict(zip(FEATURE_COLUMNS, extract_feature_vector(metrics)))
+
+
+def features_to_matrix(feature_rows: List[Mapping[str, float]]) -> np.ndarray:
+    """
+    Stack already computed feature dictionaries into a matrix
+
+    Args:
+        feature_rows: Feature dictionaries (missing features are 0)
+
+    Returns:
+        Array of shape (len(feature_rows), len(FEATURE_COLUMNS))
+    """
+    return np.array(
+        [[row.get(name, 0.0) for name in FEATURE_COLUMNS] for row in feature_rows],
+        dtype=np.float64
+    ).reshape(len(feature_rows), len(FEATURE_COLUMNS))
+
+
+def check_feature_schema(feature_columns: List[str], feature_set_version: Any, source: str):
+    """
+    Raise if a model was built for a different feature definition
+
+    Args:
+        feature_columns: Column order recorded with the model
+        feature_set_version: FEATURE_SET_VERSION recorded with the model
+        source: Model description used in the error message
+    """
+    if feature_set_version != FEATURE_SET_VERSION or list(feature_columns) != FEATURE_COLUMNS:
+        raise ValueError(
+            f"{source} was built for feature set v{feature_set_version}, "
+            f"this service computes v{FEATURE_SET_VERSION}"
+        )
@@ -0,0 +1,170 @@
+"""
+Fee and gas-limit strategy for oracle transactions
+Caches fee data for roughly a block and gas estimates per call shape, so
+sending a transaction needs no fee or estimation round trips
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from web3 import Web3
+
+from .concurrency import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Fee data is reused for this long (about one Morph block)
+ORACLE_FEE_CACHE_SECONDS = float(os.getenv("ORACLE_FEE_CACHE_SECONDS", "2"))
+# The suggested priority fee changes slowly, so it is cached longer
+ORACLE_PRIORITY_FEE_CACHE_SECONDS = float(os.getenv("ORACLE_PRIORITY_FEE_CACHE_SECONDS", "30"))
+# maxFeePerGas = base fee * this + priority fee (headroom for base fee increases)
+ORACLE_BASE_FEE_MULTIPLIER = float(os.getenv("ORACLE_BASE_FEE_MULTIPLIER", "2"))
+# Safety margin applied to gas estimates (1.2 = +20%)
+ORACLE_GAS_LIMIT_MULTIPLIER = float(os.getenv("ORACLE_GAS_LIMIT_MULTIPLIER", "1.2"))
+# Used only when a call cannot be estimated: worst-case gas per updated user
+# (a first-time wallet writes a new 4-slot ScoreData record, ~4 x 20k SSTORE,
+# plus its oracle nonce and event) and fixed cost per call
+ORACLE_GAS_PER_USER = int(os.getenv("ORACLE_GAS_PER_USER", "120000"))
+ORACLE_GAS_PER_CALL = int(os.getenv("ORACLE_GAS_PER_CALL", "100000"))
+
+
+class FeeStrategy:
+    """
+    Transaction fee fields and gas limits for one chain
+
+    Uses EIP-1559 fields (maxFeePerGas / maxPriorityFeePerGas) when the
+    latest block reports a base fee and falls back to a legacy gasPrice
+    otherwise. Gas limits are estimated once per call shape, e.g.
+    ("submitBatchScoreUpdate", 100), with a safety margin, and reused until
+    a transaction of that shape fails on-chain. Every limit is capped at the
+    block gas limit.
+    """
+
+    def __init__(self, w3: Web3, fee_cache_seconds: float = ORACLE_FEE_CACHE_SECONDS):
+        self.w3 = w3
+        self.fee_cache_seconds = fee_cache_seconds
+        self._chain_id: Optional[int] = None
+        self._fees: Optional[Dict[str, int]] = None
+        self._fees_fetched_at = 0.0
+        self._priority_fee: Optional[int] = None
+        self._priority_fee_fetched_at = 0.0
+        self._block_gas_limit: Optional[int] = None
+        self._gas_limits: Dict[Tuple[str, int], int] = {}
+        self._flights = SingleFlight()
+
+    async def chain_id(self) -> int:
+        """Chain id (read once)"""
+        if self._chain_id is None:
+            self._chain_id = await self._flights.do("chain_id", lambda: asyncio.to_thread(lambda: self.w3.eth.chain_id))
+        return self._chain_id
+
+    async def fee_fields(self) -> Dict[str, int]:
+        """
+        Fee fields for a new transaction
+
+        Returns:
+            {"maxFeePerGas", "maxPriorityFeePerGas"} or {"gasPrice"}
+        """
+        if self._fees is None or time.monotonic() - self._fees_fetched_at > self.fee_cache_seconds:
+            self._fees = await self._flights.do("fees", self._fetch_fees)
+            self._fees_fetched_at = time.monotonic()
+        return dict(self._fees)
+
+    async def _fetch_fees(self) -> Dict[str, int]:
+        block = await asyncio.to_thread(self.w3.eth.get_block, "latest")
+        base_fee = block.get("baseFeePerGas")
+        if block.get("gasLimit"):
+            self._block_gas_limit = int(block["gasLimit"])
+
+        if base_fee is None:
+            gas_price = await asyncio.to_thread(lambda: self.w3.eth.gas_price)
+            return {"gasPrice": gas_price}
+
+        if self._priority_fee is None or time.monotonic() - self._priority_fee_fetched_at > ORACLE_PRIORITY_FEE_CACHE_SECONDS:
+            try:
+                self._priority_fee = await asyncio.to_thread(lambda: self.w3.eth.max_priority_fee)
+            except Exception as e:
+                logger.warning(f"Could not read priority fee, using 0: {str(e)}")
+                self._priority_fee = 0
+            self._priority_fee_fetched_at = time.monotonic()
+
+        return {
+            "maxFeePerGas": int(base_fee * ORACLE_BASE_FEE_MULTIPLIER) + self._priority_fee,
+            "maxPriorityFeePerGas": self._priority_fee
+        }
+
+    async def block_gas_limit(self) -> Optional[int]:
+        """Gas limit of the latest block (refreshed with the fee data), None if unknown"""
+        await self.fee_fields()
+        return self._block_gas_limit
+
+    async def max_batch_users(self) -> Optional[int]:
+        """Most users a batch can update while its worst-case gas still fits in a block (None if unknown)"""
+        block_limit = await self.block_gas_limit()
+        if not block_limit:
+            return None
+        return max(1, (block_limit - ORACLE_GAS_PER_CALL) // ORACLE_GAS_PER_USER)
+
+    async def gas_limit(self, method: str, users: int, contract_call, sender: str) -> int:
+        """
+        Gas limit for a call, estimated once per (method, users) shape
+
+        Args:
+            method: Contract method name, e.g. "submitBatchScoreUpdate"
+            users: Number of users the call updates
+            contract_call: Bound contract function used for the estimate
+            sender: Address the transaction is sent from
+
+        Returns:
+            Gas limit, capped at the block gas limit
+        """
+        shape = (method, users)
+        limit = self._gas_limits.get(shape)
+        if limit is None:
+            try:
+                estimate = await self._flights.do(
+                    ("gas", shape), lambda: asyncio.to_thread(contract_call.estimate_gas, {"from": sender})
+                )
+                limit = int(estimate * ORACLE_GAS_LIMIT_MULTIPLIER)
+                self._gas_limits[shape] = limit
+                logger.info(f"Gas limit for {method} x{users}: {limit}")
+            except Exception as e:
+                # Not cached: e.g. a pipelined batch whose nonce is not current yet
+                logger.warning(f"Gas estimate failed for {method} x{users}, using the worst case: {str(e)}")
+                limit = worst_case_gas(users)
+
+        block_limit = await self.block_gas_limit()
+        return min(limit, block_limit) if block_limit else limit
+
+    def invalidate_gas(self, method: str, users: int):
+        """Forget the cached gas limit of a call shape (e.g. after an out-of-gas receipt)"""
+        if self._gas_limits.pop((method, users), None) is not None:
+            logger.warning(f"Dropped cached gas limit for {method} x{users}")
+
+    async def transaction_fields(self, method: str, users: int, contract_call, sender: str) -> Dict[str, Any]:
+        """
+        All fields build_transaction would otherwise fetch over RPC
+
+        Args:
+            method: Contract method name
+            users: Number of users the call updates
+            contract_call: Bound contract function
+            sender: Address the transaction is sent from
+
+        Returns:
+            chainId, gas and fee fields
+        """
+        chain_id, fees, gas = await asyncio.gather(
+            self.chain_id(),
+            self.fee_fields(),
+            self.gas_limit(method, users, contract_call, sender)
+        )
+        return {"chainId": chain_id, "gas": gas, **fees}
+
+
+def worst_case_gas(users: int) -> int:
+    """Gas limit that covers a call writing first-time records for every user"""
+    return ORACLE_GAS_PER_CALL + ORACLE_GAS_PER_USER * users
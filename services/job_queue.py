@@ -0,0 +1,438 @@
+"""
+Background job queue for long-running scoring and oracle workloads
+Jobs are persisted in SQLite and executed by a pool of asyncio workers,
+with retries and progress reporting. A running job is leased to the queue
+instance executing it; the lease is renewed while the job runs, and only jobs
+whose lease has expired are picked up again by other workers or processes.
+Handlers can checkpoint state in the job row, so a retried job resumes
+instead of repeating stages with side effects
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding the queue (jobs survive restarts)
+JOB_QUEUE_DB_PATH = os.getenv("JOB_QUEUE_DB_PATH", "jobs.db")
+# Number of jobs executed at the same time
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+# Retries after a failed attempt, with exponential backoff between them
+JOB_MAX_RETRIES = int(os.getenv("JOB_MAX_RETRIES", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+# How often idle workers look for due jobs (e.g. retries whose backoff expired)
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+# Lease on a running job; renewed every third of it, so a job whose owner died is picked up again after this
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+JOB_TERMINAL_STATUSES = (JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED)
+
+ProgressReporter = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class NonRetryableJobError(Exception):
+    """Raised by a handler when retrying the job would be unsafe; the job fails immediately"""
+
+
+class JobCheckpoint:
+    """
+    Resumable state of a job, persisted in its row
+
+    Later attempts of the job receive the state saved by earlier ones.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]], save: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.state: Dict[str, Any] = dict(state or {})
+        self._save = save
+
+    async def save(self, **state):
+        """Merge values into the state and persist it before returning"""
+        self.state.update(state)
+        await self._save(self.state)
+
+
+JobHandler = Callable[[Dict[str, Any], ProgressReporter, JobCheckpoint], Awaitable[Dict[str, Any]]]
+
+
+class SQLiteJobStore:
+    """Persistent job storage backed by a local SQLite file"""
+
+    _COLUMNS = (
+        "id, kind, status, payload, progress, result, error, "
+        "attempts, max_retries, run_after, created_at, updated_at, owner, lease_expires_at, state"
+    )
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, progress TEXT, result TEXT, error TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, max_retries INTEGER NOT NULL, "
+            "run_after REAL NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        # Lease and checkpoint columns were added later; upgrade existing queue files in place
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, column_type in (("owner", "TEXT"), ("lease_expires_at", "REAL"), ("state", "TEXT")):
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, run_after)")
+
+    @classmethod
+    def _to_dict(cls, row) -> Dict[str, Any]:
+        (job_id, kind, status, payload, progress, result, error,
+         attempts, max_retries, run_after, created_at, updated_at, owner, lease_expires_at, state) = row
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "payload": json.loads(payload),
+            "progress": json.loads(progress) if progress else None,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "attempts": attempts,
+            "max_retries": max_retries,
+            "run_after": run_after,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "owner": owner,
+            "lease_expires_at": lease_expires_at,
+            "state": json.loads(state) if state else None
+        }
+
+    def create(self, kind: str, payload: Dict[str, Any], max_retries: int) -> Dict[str, Any]:
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({self._COLUMNS}) VALUES (?, ?, ?, ?, NULL, NULL, NULL, 0, ?, ?, ?, ?, NULL, NULL, NULL)",
+                (job_id, kind, JOB_STATUS_QUEUED, json.dumps(payload), max_retries, now, now, now)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim_next(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Atomically lease the oldest due job to an owner and return it
+
+        Due jobs are queued jobs whose run_after has passed and running jobs
+        whose lease expired (their owner stopped renewing it).
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM jobs "
+                    "WHERE (status = ? AND run_after <= ?) "
+                    "OR (status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)) "
+                    "ORDER BY run_after, created_at LIMIT 1",
+                    (JOB_STATUS_QUEUED, now, JOB_STATUS_RUNNING, now)
+                ).fetchone()
+                if row is not None:
+                    if row[2] == JOB_STATUS_RUNNING:
+                        logger.warning(f"Lease of job {row[0]} held by {row[12]} expired, reclaiming it")
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, "
+                        "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                        (JOB_STATUS_RUNNING, owner, now + lease_seconds, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return self.get(row[0])
+
+    def update(self, job_id: str, lease_owner: Optional[str] = None, **fields) -> bool:
+        """
+        Update status, progress, result, error, state or run_after of a job
+
+        With lease_owner, the row is only updated while that owner holds the
+        job's lease. Returns whether a row was updated.
+        """
+        assignments = []
+        values = []
+        for name, value in fields.items():
+            if name in ("progress", "result", "state") and value is not None:
+                value = json.dumps(value)
+            assignments.append(f"{name} = ?")
+            values.append(value)
+        assignments.append("updated_at = ?")
+        values.extend([time.time(), job_id])
+        condition = "id = ?"
+        if lease_owner is not None:
+            condition += " AND status = ? AND owner = ?"
+            values.extend([JOB_STATUS_RUNNING, lease_owner])
+        with self._lock:
+            cursor = self._conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE {condition}", values)
+        return cursor.rowcount > 0
+
+    def renew_lease(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend a running job's lease; False if the owner no longer holds it"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time() + lease_seconds, job_id, JOB_STATUS_RUNNING, owner)
+            )
+        return cursor.rowcount > 0
+
+    def release(self, owner: str) -> int:
+        """Return the running jobs leased to an owner to the queue (graceful shutdown)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = ? AND owner = ?",
+                (JOB_STATUS_QUEUED, time.time(), JOB_STATUS_RUNNING, owner)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """
+    Persistent queue of background jobs executed by asyncio workers
+
+    Handlers are registered per job kind as
+    `async handler(payload, report, checkpoint)` and return a
+    JSON-serializable result; `report(progress)` records progress that
+    pollers and event streams can observe, and `checkpoint.save(...)`
+    persists state for later attempts. A handler that raises is retried
+    with exponential backoff up to the job's retry limit, unless it raises
+    NonRetryableJobError.
+    Several queue instances (e.g. app processes) can share one database:
+    each job is leased to the instance running it.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOB_QUEUE_DB_PATH,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        max_retries: int = JOB_MAX_RETRIES,
+        retry_backoff_seconds: float = JOB_RETRY_BACKOFF_SECONDS,
+        lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        self.db_path = db_path
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.lease_seconds = lease_seconds
+        # Identifies this instance's leases in the shared database
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._store: Optional[SQLiteJobStore] = None
+        self._handlers: Dict[str, JobHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed: Optional[asyncio.Condition] = None
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine function that executes jobs of a kind"""
+        self._handlers[kind] = handler
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Open the store and start the workers (jobs with expired leases are picked up again)"""
+        if self._workers:
+            return
+        self._store = await asyncio.to_thread(SQLiteJobStore, self.db_path)
+        self._wakeup = asyncio.Event()
+        self._changed = asyncio.Condition()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        logger.info(f"Job queue started with {self.concurrency} workers")
+
+    async def stop(self):
+        """Stop the workers and return the jobs they were running to the queue"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._store is not None:
+            released = self._store.release(self.owner)
+            if released:
+                logger.info(f"Returned {released} interrupted jobs to the queue")
+            self._store.close()
+            self._store = None
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist a new job and wake a worker
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable job input
+
+        Returns:
+            The queued job record
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._store is None:
+            raise RuntimeError("Job queue is not running")
+        job = await asyncio.to_thread(self._store.create, kind, payload, self.max_retries)
+        self._wakeup.set()
+        await self._notify()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id"""
+        if self._store is None:
+            raise RuntimeError("Job queue is not running")
+        return await asyncio.to_thread(self._store.get, job_id)
+
+    async def watch(self, job_id: str, keepalive_seconds: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a job's record every time it changes, until it finishes
+
+        Args:
+            job_id: Job to follow
+            keepalive_seconds: Re-check interval when no change is signalled
+
+        Yields:
+            Job records (the last one has a terminal status)
+        """
+        last_update = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield job
+            if job["status"] in JOB_TERMINAL_STATUSES:
+                return
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _update(self, job_id: str, **fields) -> bool:
+        updated = await asyncio.to_thread(self._store.update, job_id, self.owner, **fields)
+        await self._notify()
+        return updated
+
+    async def _renew_lease(self, job_id: str, work: asyncio.Task):
+        """Keep a job's lease alive; cancel the work if the lease is lost"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await asyncio.to_thread(self._store.renew_lease, job_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Could not renew lease of job {job_id}: {str(e)}")
+                continue
+            if not held:
+                logger.error(f"Lost lease of job {job_id}, stopping it")
+                work.cancel()
+                return
+
+    async def _worker(self):
+        while True:
+            job = await asyncio.to_thread(self._store.claim_next, self.owner, self.lease_seconds)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._notify()
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]):
+        job_id = job["id"]
+
+        async def report(progress: Dict[str, Any]):
+            await self._update(job_id, progress=progress)
+
+        async def save_state(state: Dict[str, Any]):
+            if not await self._update(job_id, state=state):
+                raise RuntimeError(f"Job {job_id} is no longer leased to this worker")
+
+        checkpoint = JobCheckpoint(job["state"], save_state)
+        handler = self._handlers.get(job["kind"])
+        work = asyncio.create_task(handler(job["payload"], report, checkpoint)) if handler else None
+        renewer = asyncio.create_task(self._renew_lease(job_id, work)) if work else None
+        try:
+            if work is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            result = await work
+            await self._update(
+                job_id, status=JOB_STATUS_SUCCEEDED, result=result, error=None, state=None,
+                owner=None, lease_expires_at=None
+            )
+            logger.info(f"Job {job_id} ({job['kind']}) succeeded")
+
+        except asyncio.CancelledError:
+            if renewer is not None and renewer.done() and not renewer.cancelled():
+                # Lease lost: the job now belongs to another owner
+                return
+            if work is not None:
+                work.cancel()
+            raise
+        except Exception as e:
+            if job["attempts"] <= job["max_retries"] and not isinstance(e, NonRetryableJobError):
+                delay = self.retry_backoff_seconds * (2 ** (job["attempts"] - 1))
+                logger.warning(f"Job {job_id} attempt {job['attempts']} failed, retrying in {delay}s: {str(e)}")
+                await self._update(
+                    job_id, status=JOB_STATUS_QUEUED, error=str(e), run_after=time.time() + delay,
+                    owner=None, lease_expires_at=None
+                )
+            else:
+                logger.error(f"Job {job_id} failed after {job['attempts']} attempts: {str(e)}")
+                await self._update(
+                    job_id, status=JOB_STATUS_FAILED, error=str(e), state=None, owner=None, lease_expires_at=None
+                )
+        finally:
+            if renewer is not None:
+                renewer.cancel()
+
+
+def public_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job record as exposed by the API"""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+
+# Global job queue instance (started in the application lifespan)
+job_queue = JobQueue()
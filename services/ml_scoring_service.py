@@ -4,21 +4,37 @@ Combines rule-based scoring with machine learning models
 """
 
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
 import logging
-from typing import Dict, Any, List, Tuple
+import os
+import warnings
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 import asyncio
 import httpx
 from web3 import Web3
 
+from .compiled_model import CompiledEnsemble
+from .feature_pipeline import (
+    FEATURE_COLUMNS,
+    FEATURE_SET_VERSION,
+    check_feature_schema,
+    extract_feature_dict,
+    features_to_matrix,
+    metrics_to_matrix,
+)
+
+# pandas, sklearn and joblib are only needed for training and are imported
+# on first use, so a process serving a compiled model never loads them
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Trained model served by the API: a compiled model directory or a .joblib file
+MODEL_ARTIFACT_PATH = os.getenv("MODEL_ARTIFACT_PATH", "models/credo_compiled")
+# Memory-map model arrays ("r") so worker processes share one copy via the page cache; empty loads them into memory
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE", "r") or None
+
 class MLCredoScorer:
     """
     Machine Learning-based Credo Score calculator
@@ -30,8 +46,15 @@ class MLCredoScorer:
         self.scalers = {}
         self.feature_importance = {}
         self.is_trained = False
+        self.model_version = "untrained"
+        # Set when serving from a compiled model instead of sklearn objects
+        self.compiled: Optional[CompiledEnsemble] = None
+    
+    def _build_models(self):
+        """Create the untrained sklearn models and scalers"""
+        from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+        from sklearn.preprocessing import StandardScaler, RobustScaler
         
-        # Initialize models
         self.models['rf'] = RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
@@ -60,193 +83,60 @@ class MLCredoScorer:
         Returns:
             Dictionary of advanced features
         """
-        features = {}
-        
-        # Basic features from existing system
-        features['wallet_age_days'] = float(basic_metrics.get('wallet_age_days', 0))
-        features['transaction_count'] = float(basic_metrics.get('transaction_count', 0))
-        features['eth_balance'] = float(basic_metrics.get('eth_balance', 0))
-        features['liquidation_count'] = float(basic_metrics.get('liquidation_count', 0))
-        features['stablecoin_percentage'] = float(basic_metrics.get('stablecoin_percentage', 0))
-        features['balance_stability_score'] = float(basic_metrics.get('balance_stability_score', 0))
-        features['total_portfolio_value_usd'] = float(basic_metrics.get('total_portfolio_value_usd', 0))
-        
-        # Advanced derived features
-        
-        # 1. Activity Ratios
-        if features['wallet_age_days'] > 0:
-            features['tx_per_day'] = features['transaction_count'] / features['wallet_age_days']
-            features['value_per_day'] = features['total_portfolio_value_usd'] / features['wallet_age_days']
-        else:
-            features['tx_per_day'] = 0
-            features['value_per_day'] = 0
-        
-        # 2. Risk Indicators
-        features['liquidation_rate'] = features['liquidation_count'] / max(1, features['transaction_count'])
-        features['portfolio_concentration'] = 100 - features['stablecoin_percentage']  # Higher = more concentrated in volatile assets
-        
-        # 3. Wealth Indicators
-        features['eth_dominance'] = (features['eth_balance'] * 2000) / max(1, features['total_portfolio_value_usd']) * 100
-        features['log_portfolio_value'] = np.log1p(features['total_portfolio_value_usd'])
-        
-        # 4. Behavioral Patterns
-        features['is_whale'] = 1.0 if features['total_portfolio_value_usd'] > 100000 else 0.0
-        features['is_active_trader'] = 1.0 if features['tx_per_day'] > 1.0 else 0.0
-        features['is_hodler'] = 1.0 if features['tx_per_day'] < 0.1 and features['wallet_age_days'] > 365 else 0.0
-        
-        # 5. Stability Metrics
-        features['stability_age_ratio'] = features['balance_stability_score'] * features['wallet_age_days'] / 365
-        features['diversification_score'] = min(features['stablecoin_percentage'], 100 - features['stablecoin_percentage'])
-        
-        return features
+        return extract_feature_dict(basic_metrics)
     
-    def create_synthetic_training_data(self, n_samples: int = 10000) -> Tuple[pd.DataFrame, np.ndarray]:
+    def create_synthetic_training_data(self, n_samples: int = 10000, seed: int = 42) -> Tuple["pd.DataFrame", np.ndarray]:
         """
         Create synthetic training data based on DeFi patterns
         In production, this would be replaced with real historical data
         
         Args:
             n_samples: Number of synthetic samples to generate
+            seed: Random seed
             
         Returns:
             Tuple of (features_df, target_scores)
         """
-        np.random.seed(42)
-        
-        # Generate synthetic wallet data
-        data = []
-        
-        for _ in range(n_samples):
-            # Generate correlated features that make sense for DeFi
-            wallet_age = np.random.exponential(200)  # Most wallets are newer
-            wallet_age = min(wallet_age, 2000)  # Cap at ~5.5 years
-            
-            # Transaction count correlated with age
-            base_tx_rate = np.random.lognormal(0, 1)  # Log-normal distribution
-            tx_count = int(wallet_age * base_tx_rate / 30)  # Transactions per month
-            tx_count = max(0, min(tx_count, 10000))
-            
-            # Portfolio value - power law distribution (few whales, many small wallets)
-            portfolio_value = np.random.pareto(1.16) * 1000  # Pareto distribution
-            portfolio_value = min(portfolio_value, 10000000)  # Cap at $10M
-            
-            # ETH balance correlated with portfolio value
-            eth_balance = portfolio_value * np.random.beta(2, 5) / 2000  # Beta distribution for allocation
-            
-            # Stablecoin percentage - preference for stability
-            stablecoin_pct = np.random.beta(2, 3) * 100  # Skewed towards lower percentages
-            
-            # Liquidation events - rare but impactful
-            liquidation_prob = 0.05 + (0.1 if portfolio_value > 50000 else 0)  # Whales more likely to get liquidated
-            liquidation_count = np.random.poisson(liquidation_prob * tx_count / 100)
-            
-            # Balance stability - correlated with experience and portfolio size
-            stability_base = 50 + (wallet_age / 10) + (np.log1p(portfolio_value) * 2)
-            stability_noise = np.random.normal(0, 15)
-            balance_stability = max(0, min(100, stability_base + stability_noise))
-            
-            sample = {
-                'wallet_age_days': wallet_age,
-                'transaction_count': tx_count,
-                'eth_balance': eth_balance,
-                'liquidation_count': liquidation_count,
-                'stablecoin_percentage': stablecoin_pct,
-                'balance_stability_score': balance_stability,
-                'total_portfolio_value_usd': portfolio_value
-            }
-            
-            data.append(sample)
+        import pandas as pd
+        from .synthetic_data import generate_synthetic_dataset
         
-        # Convert to DataFrame and extract features
-        df = pd.DataFrame(data)
-        
-        # Extract advanced features for each sample
-        feature_rows = []
-        for _, row in df.iterrows():
-            features = self.extract_advanced_features("synthetic", row.to_dict())
-            feature_rows.append(features)
-        
-        features_df = pd.DataFrame(feature_rows)
-        
-        # Generate target scores based on realistic credit scoring logic
-        target_scores = []
-        for _, row in features_df.iterrows():
-            score = self.calculate_synthetic_target_score(row.to_dict())
-            target_scores.append(score)
-        
-        return features_df, np.array(target_scores)
+        X, target_scores = generate_synthetic_dataset(n_samples, seed)
+        return pd.DataFrame(X, columns=FEATURE_COLUMNS), target_scores
     
     def calculate_synthetic_target_score(self, features: Dict[str, float]) -> float:
         """
-        Calculate synthetic target scores for training
+        Calculate a synthetic target score for one feature dictionary
         Based on realistic DeFi credit scoring principles
         """
-        score = 500  # Base score
-        
-        # Wallet maturity (0-150 points)
-        age_score = min(150, features['wallet_age_days'] * 150 / 730)  # 2 years for max
-        score += age_score
-        
-        # Activity level (0-100 points)
-        activity_score = min(100, features['tx_per_day'] * 100)
-        score += activity_score
-        
-        # Portfolio size (0-100 points) - log scale
-        wealth_score = min(100, features['log_portfolio_value'] * 10)
-        score += wealth_score
+        from .synthetic_data import synthetic_target_scores
         
-        # Stability (0-100 points)
-        stability_score = features['balance_stability_score']
-        score += stability_score
-        
-        # Diversification (0-75 points)
-        diversification_score = features['diversification_score'] * 0.75
-        score += diversification_score
-        
-        # Penalties
-        # Liquidation penalty (-50 points per liquidation)
-        liquidation_penalty = features['liquidation_count'] * 50
-        score -= liquidation_penalty
-        
-        # Extreme concentration penalty
-        if features['portfolio_concentration'] > 90:
-            score -= 50
-        
-        # Inactivity penalty
-        if features['tx_per_day'] < 0.01 and features['wallet_age_days'] > 30:
-            score -= 25
-        
-        # Bonuses
-        # Whale bonus (if managed well)
-        if features['is_whale'] and features['liquidation_count'] == 0:
-            score += 25
-        
-        # Long-term holder bonus
-        if features['is_hodler'] and features['balance_stability_score'] > 70:
-            score += 25
-        
-        # Ensure score is in valid range
-        score = max(0, min(1000, score))
-        
-        # Add some noise to make it more realistic
-        noise = np.random.normal(0, 10)
-        score = max(0, min(1000, score + noise))
-        
-        return score
+        return float(synthetic_target_scores(features_to_matrix([features]), np.random.default_rng())[0])
     
-    def train_models(self, features_df: pd.DataFrame, target_scores: np.ndarray):
+    def train_models(self, features_df: "pd.DataFrame", target_scores: np.ndarray):
         """
         Train the ML models on the provided data
         
         Args:
-            features_df: DataFrame with features
+            features_df: DataFrame with features, or a matrix in FEATURE_COLUMNS order
             target_scores: Array of target scores
         """
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import mean_squared_error, r2_score
+        
         logger.info("Training ML models for credit scoring...")
         
+        if not self.models:
+            self._build_models()
+        
+        # Train on a plain matrix in the fixed column order used at inference
+        if hasattr(features_df, 'columns'):
+            X = features_df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        else:
+            X = np.asarray(features_df, dtype=np.float64)
+        
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
-            features_df, target_scores, test_size=0.2, random_state=42
+            X, target_scores, test_size=0.2, random_state=42
         )
         
         # Scale features
@@ -260,7 +150,7 @@ class MLCredoScorer:
             if name == 'rf':
                 model.fit(X_train, y_train)
                 y_pred = model.predict(X_test)
-                self.feature_importance[name] = dict(zip(features_df.columns, model.feature_importances_))
+                self.feature_importance[name] = dict(zip(FEATURE_COLUMNS, model.feature_importances_))
             else:
                 model.fit(X_train_scaled, y_train)
                 y_pred = model.predict(X_test_scaled)
@@ -272,6 +162,8 @@ class MLCredoScorer:
             logger.info(f"{name} model - MSE: {mse:.2f}, R2: {r2:.3f}")
         
         self.is_trained = True
+        self.compiled = None
+        self.model_version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
         logger.info("ML model training completed!")
     
     def predict_score(self, features: Dict[str, float]) -> Dict[str, Any]:
@@ -288,34 +180,81 @@ class MLCredoScorer:
             logger.warning("Models not trained, using rule-based fallback")
             return self.rule_based_fallback(features)
         
-        # Convert to DataFrame
-        feature_df = pd.DataFrame([features])
+        batch = self.predict_batch(features_to_matrix([features]))
+        
+        return {
+            'ensemble_score': int(batch['ensemble_score'][0]),
+            'individual_predictions': {
+                'random_forest': float(batch['random_forest'][0]),
+                'gradient_boosting': float(batch['gradient_boosting'][0])
+            },
+            'confidence': float(batch['confidence'][0]),
+            'feature_importance': self.feature_importance.get('rf', {}),
+            'model_type': 'ml_ensemble'
+        }
+    
+    def predict_batch(self, X: np.ndarray) -> Dict[str, Any]:
+        """
+        Predict credit scores for many wallets in one pass per model
+        
+        Args:
+            X: Feature matrix of shape (n, len(FEATURE_COLUMNS)) in FEATURE_COLUMNS order
+        
+        Returns:
+            Dictionary of per-row arrays: ensemble_score, random_forest,
+            gradient_boosting and confidence, plus the model_type
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(FEATURE_COLUMNS):
+            raise ValueError(f"Expected a feature matrix with {len(FEATURE_COLUMNS)} columns, got shape {X.shape}")
         
-        # Make predictions with each model
-        predictions = {}
+        if self.compiled is not None:
+            return self.compiled.predict_batch(X)
+        
+        if not self.is_trained:
+            logger.warning("Models not trained, using rule-based fallback")
+            scores = np.array([
+                self.rule_based_fallback(dict(zip(FEATURE_COLUMNS, row)))['ensemble_score'] for row in X
+            ], dtype=np.int64)
+            return {
+                'ensemble_score': scores,
+                'random_forest': None,
+                'gradient_boosting': None,
+                'confidence': np.full(len(X), 0.7),
+                'model_type': 'rule_based_enhanced'
+            }
         
-        # Random Forest (uses raw features)
-        rf_pred = self.models['rf'].predict(feature_df)[0]
-        predictions['random_forest'] = max(0, min(1000, rf_pred))
+        if len(X) == 0:
+            empty = np.zeros(0)
+            return {
+                'ensemble_score': empty.astype(np.int64),
+                'random_forest': empty,
+                'gradient_boosting': empty,
+                'confidence': empty,
+                'model_type': 'ml_ensemble'
+            }
         
-        # Gradient Boosting (uses scaled features)
-        feature_scaled = self.scalers['standard'].transform(feature_df)
-        gb_pred = self.models['gb'].predict(feature_scaled)[0]
-        predictions['gradient_boosting'] = max(0, min(1000, gb_pred))
+        with warnings.catch_warnings():
+            # Artifacts trained on DataFrames still carry column names
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            
+            # Random Forest (uses raw features)
+            rf_pred = np.clip(self.models['rf'].predict(X), 0, 1000)
+            
+            # Gradient Boosting (uses scaled features)
+            gb_pred = np.clip(self.models['gb'].predict(self.scalers['standard'].transform(X)), 0, 1000)
         
         # Ensemble prediction (weighted average)
-        ensemble_score = (predictions['random_forest'] * 0.6 + 
-                         predictions['gradient_boosting'] * 0.4)
+        ensemble_score = rf_pred * 0.6 + gb_pred * 0.4
         
-        # Calculate confidence based on agreement between models
-        model_agreement = 1 - abs(predictions['random_forest'] - predictions['gradient_boosting']) / 1000
-        confidence = max(0.5, model_agreement)  # Minimum 50% confidence
+        # Confidence from agreement between models (minimum 50%)
+        confidence = np.maximum(0.5, 1 - np.abs(rf_pred - gb_pred) / 1000)
         
         return {
-            'ensemble_score': int(ensemble_score),
-            'individual_predictions': predictions,
+            'ensemble_score': ensemble_score.astype(np.int64),
+            'random_forest': rf_pred,
+            'gradient_boosting': gb_pred,
             'confidence': confidence,
-            'feature_importance': self.feature_importance.get('rf', {}),
             'model_type': 'ml_ensemble'
         }
     
@@ -380,31 +319,113 @@ class MLCredoScorer:
     
     def save_models(self, filepath: str):
         """Save trained models to disk"""
+        import joblib
+        
         model_data = {
             'models': self.models,
             'scalers': self.scalers,
             'feature_importance': self.feature_importance,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'model_version': self.model_version,
+            'feature_columns': FEATURE_COLUMNS,
+            'feature_set_version': FEATURE_SET_VERSION
         }
         joblib.dump(model_data, filepath)
         logger.info(f"Models saved to {filepath}")
     
-    def load_models(self, filepath: str):
-        """Load trained models from disk"""
+    def load_models(self, filepath: str, mmap_mode: Optional[str] = None):
+        """Load trained models from disk (mmap_mode is passed to joblib.load)"""
         try:
-            model_data = joblib.load(filepath)
+            import joblib
+            
+            model_data = joblib.load(filepath, mmap_mode=mmap_mode)
+            if 'feature_columns' in model_data:
+                check_feature_schema(model_data['feature_columns'], model_data.get('feature_set_version'), filepath)
             self.models = model_data['models']
             self.scalers = model_data['scalers']
             self.feature_importance = model_data['feature_importance']
             self.is_trained = model_data['is_trained']
+            self.model_version = model_data.get('model_version', 'unversioned')
+            self.compiled = None
             logger.info(f"Models loaded from {filepath}")
         except Exception as e:
             logger.error(f"Error loading models: {str(e)}")
             self.is_trained = False
+    
+    def export_compiled(self, path: str) -> str:
+        """
+        Export the trained models as a compiled model directory
+        
+        Args:
+            path: Output directory
+        
+        Returns:
+            The output directory
+        """
+        from .compiled_model import export_compiled_model
+        
+        return export_compiled_model(self, path)
+    
+    def load_compiled(self, path: str, mmap_mode: Optional[str] = None):
+        """
+        Serve predictions from a compiled model directory (no sklearn needed)
+        
+        Args:
+            path: Directory written by export_compiled
+            mmap_mode: Passed to np.load (e.g. "r" to memory-map the arrays)
+        """
+        compiled = CompiledEnsemble.load(path, mmap_mode=mmap_mode)
+        check_feature_schema(compiled.feature_columns, compiled.manifest.get('feature_set_version'), path)
+        
+        self.compiled = compiled
+        self.feature_importance = compiled.feature_importance
+        self.is_trained = True
+        self.model_version = compiled.model_version
+        logger.info(f"Compiled model {compiled.model_version} loaded from {path}")
 
 # Global ML scorer instance
 ml_scorer = MLCredoScorer()
 
+# State of the model loaded for serving, reported by the readiness endpoint
+serving_model_status: Dict[str, Any] = {"loaded": False, "artifact": None, "model_version": None}
+
+def load_serving_model(path: str = MODEL_ARTIFACT_PATH, mmap_mode: Optional[str] = MODEL_MMAP_MODE) -> Dict[str, Any]:
+    """
+    Load the trained model artifact into the global scorer
+    
+    A compiled model directory is loaded with memory-mapped NumPy arrays and
+    needs no sklearn; a .joblib file is loaded with joblib (also memory-mapped).
+    If nothing can be loaded the scorer keeps using the rule-based fallback.
+    
+    Args:
+        path: Compiled model directory or .joblib file
+        mmap_mode: Memory-map mode for the model arrays (None loads them into memory)
+    
+    Returns:
+        Serving model status
+    """
+    serving_model_status.update({"loaded": False, "artifact": path, "model_version": None})
+    serving_model_status.pop("error", None)
+    
+    try:
+        if os.path.isdir(path):
+            ml_scorer.load_compiled(path, mmap_mode=mmap_mode)
+        elif os.path.isfile(path):
+            ml_scorer.load_models(path, mmap_mode=mmap_mode)
+            if not ml_scorer.is_trained:
+                raise ValueError(f"Could not load models from {path}")
+        else:
+            raise FileNotFoundError(f"Model artifact not found: {path}")
+        
+        serving_model_status.update({"loaded": True, "model_version": ml_scorer.model_version})
+        logger.info(f"Serving ML model {ml_scorer.model_version} from {path}")
+    
+    except Exception as e:
+        logger.warning(f"ML model not loaded, using rule-based fallback: {str(e)}")
+        serving_model_status["error"] = str(e)
+    
+    return dict(serving_model_status)
+
 async def calculate_ml_enhanced_score(address: str, basic_metrics: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate ML-enhanced credit score
@@ -452,6 +473,62 @@ async def calculate_ml_enhanced_score(address: str, basic_metrics: Dict[str, Any
             'model_type': 'fallback'
         }
 
+def calculate_ml_enhanced_scores(basic_metrics_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calculate ML-enhanced credit scores for many wallets with one model pass
+    
+    Args:
+        basic_metrics_list: Basic metrics for each wallet
+    
+    Returns:
+        Results in the same format as calculate_ml_enhanced_score, in input order
+    """
+    try:
+        X = metrics_to_matrix(basic_metrics_list)
+        batch = ml_scorer.predict_batch(X)
+        is_ensemble = batch['model_type'] == 'ml_ensemble'
+        
+        results = []
+        for i, metrics in enumerate(basic_metrics_list):
+            features = dict(zip(FEATURE_COLUMNS, X[i].tolist()))
+            ml_score = int(batch['ensemble_score'][i])
+            rule_based_score = calculate_rule_based_score(metrics)
+            
+            # Final ensemble (70% ML, 30% rule-based for safety)
+            if is_ensemble:
+                final_score = int(ml_score * 0.7 + rule_based_score * 0.3)
+                predictions = {
+                    'random_forest': float(batch['random_forest'][i]),
+                    'gradient_boosting': float(batch['gradient_boosting'][i])
+                }
+            else:
+                final_score = ml_score
+                predictions = {'rule_based': ml_score}
+            
+            results.append({
+                'score': final_score,
+                'ml_score': ml_score,
+                'rule_based_score': rule_based_score,
+                'confidence': float(batch['confidence'][i]),
+                'model_predictions': predictions,
+                'feature_importance': ml_scorer.feature_importance.get('rf', {}) if is_ensemble else {},
+                'advanced_features': features,
+                'model_type': batch['model_type']
+            })
+        return results
+    
+    except Exception as e:
+        logger.error(f"Error in batch ML-enhanced scoring: {str(e)}")
+        # Fallback to rule-based
+        return [
+            {
+                'score': calculate_rule_based_score(metrics),
+                'error': str(e),
+                'model_type': 'fallback'
+            }
+            for metrics in basic_metrics_list
+        ]
+
 def calculate_rule_based_score(metrics: Dict[str, Any]) -> int:
     """
     Original rule-based scoring for comparison/fallback
@@ -489,23 +566,49 @@ def calculate_rule_based_score(metrics: Dict[str, Any]) -> int:
     total_score = age_score + tx_score + liquidation_score + asset_score + stability_points
     return max(0, min(1000, int(total_score)))
 
-def initialize_ml_models():
+def initialize_ml_models(
+    n_samples: int = 10000,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    resume: bool = True
+):
     """
     Initialize and train ML models with synthetic data
     In production, this would use real historical data
+    
+    Args:
+        n_samples: Number of synthetic training rows
+        workers: Training processes (defaults to TRAINING_WORKERS)
+        chunk_size: Rows per training chunk (defaults to TRAINING_CHUNK_SIZE)
+        resume: Continue from compatible per-model checkpoints
     """
+    from .model_training import TRAINING_CHUNK_SIZE, TRAINING_WORKERS, train_ensemble
+    from .synthetic_data import write_synthetic_dataset
+    
     logger.info("Initializing ML models...")
     
-    # Generate synthetic training data
-    features_df, target_scores = ml_scorer.create_synthetic_training_data(10000)
+    # Generate synthetic training data on disk, so training can stream it
+    # (an existing dataset of the right size is reused so checkpoints can resume)
+    X_path, y_path = os.path.join('models/data', 'X.npy'), os.path.join('models/data', 'y.npy')
+    if not (resume and os.path.exists(y_path) and len(np.load(y_path, mmap_mode='r')) == n_samples):
+        X_path, y_path = write_synthetic_dataset('models/data', n_samples)
     
     # Train models
-    ml_scorer.train_models(features_df, target_scores)
+    train_ensemble(
+        X_path,
+        y_path,
+        workers=TRAINING_WORKERS if workers is None else workers,
+        chunk_size=chunk_size or TRAINING_CHUNK_SIZE,
+        resume=resume,
+        scorer=ml_scorer
+    )
     
     # Save models
     ml_scorer.save_models('models/credo_ml_models.joblib')
+    ml_scorer.export_compiled('models/credo_compiled')
     
     logger.info("ML models initialized and ready!")
+    return ml_scorer
 
 # Initialize models when module is imported
 # asyncio.create_task(initialize_ml_models())
\ No newline at end of file
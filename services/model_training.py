@@ -0,0 +1,245 @@
+"""
+Parallel, chunked training for the Credo ML ensemble
+The random forest and gradient boosting models are fitted concurrently in a
+process pool. Each reads the dataset from memory-mapped .npy files chunk by
+chunk (warm-started trees / boosting stages per chunk) and checkpoints after
+every chunk, so an interrupted run resumes where it stopped
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .feature_pipeline import FEATURE_COLUMNS, FEATURE_SET_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Processes fitting ensemble members (0 = one per member)
+TRAINING_WORKERS = int(os.getenv("TRAINING_WORKERS", "0"))
+# Rows read per training chunk; each chunk adds its share of trees / stages
+TRAINING_CHUNK_SIZE = int(os.getenv("TRAINING_CHUNK_SIZE", "500000"))
+# Fraction of rows (at the end of the dataset) held out for evaluation
+TRAINING_VALIDATION_FRACTION = float(os.getenv("TRAINING_VALIDATION_FRACTION", "0.2"))
+# Per-model checkpoints written after every chunk
+TRAINING_CHECKPOINT_DIR = os.getenv("TRAINING_CHECKPOINT_DIR", "models/checkpoints")
+
+ENSEMBLE_MEMBERS = ("rf", "gb")
+
+
+def _chunk_bounds(n_rows: int, chunk_size: int):
+    return [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+
+def _load_checkpoint(path: str, expected: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    import joblib
+
+    if not os.path.exists(path):
+        return None
+    try:
+        checkpoint = joblib.load(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+        return None
+    if any(checkpoint.get(key) != value for key, value in expected.items()):
+        logger.info(f"Checkpoint {path} belongs to a different training run, starting over")
+        return None
+    return checkpoint
+
+
+def train_member(
+    name: str,
+    X_path: str,
+    y_path: str,
+    train_rows: int,
+    chunk_size: int,
+    checkpoint_dir: str,
+    resume: bool = True,
+    n_jobs: int = 1
+) -> Dict[str, Any]:
+    """
+    Fit one ensemble member over the training rows, chunk by chunk
+
+    The forest gets an equal share of its trees per chunk; gradient boosting
+    warm-starts its next stages on each chunk, fitted to the residuals of the
+    stages before it. The scaler used by gradient boosting is fitted in a
+    first streaming pass.
+
+    Args:
+        name: "rf" or "gb"
+        X_path: Feature matrix .npy file (FEATURE_COLUMNS order)
+        y_path: Target .npy file
+        train_rows: Leading rows used for training
+        chunk_size: Rows per chunk
+        checkpoint_dir: Directory for the member's checkpoint
+        resume: Continue from an existing compatible checkpoint
+        n_jobs: Threads used by the model (forest only)
+
+    Returns:
+        {"name", "checkpoint", "chunks", "seconds"}
+    """
+    import joblib
+    from .ml_scoring_service import MLCredoScorer
+
+    started = time.perf_counter()
+    X = np.load(X_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    chunks = _chunk_bounds(train_rows, chunk_size)
+
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    checkpoint_path = os.path.join(checkpoint_dir, f"{name}.joblib")
+    run = {
+        "name": name,
+        # A rewritten dataset never resumes an older run
+        "dataset": f"{os.path.abspath(X_path)}@{os.path.getmtime(X_path)}",
+        "train_rows": train_rows,
+        "chunk_size": chunk_size,
+        "feature_set_version": FEATURE_SET_VERSION
+    }
+
+    checkpoint = _load_checkpoint(checkpoint_path, run) if resume else None
+    if checkpoint is not None:
+        model, scaler, done = checkpoint["model"], checkpoint["scaler"], checkpoint["chunks_done"]
+        logger.info(f"Resuming {name} from chunk {done}/{len(chunks)}")
+    else:
+        scorer = MLCredoScorer()
+        scorer._build_models()
+        model, scaler, done = scorer.models[name], None, 0
+        if name == "gb":
+            scaler = scorer.scalers['standard']
+            for start, stop in chunks:
+                scaler.partial_fit(X[start:stop])
+
+    # Every chunk adds at least one tree / stage
+    total_estimators = max(model.n_estimators, len(chunks))
+    model.set_params(warm_start=True)
+    if name == "rf":
+        model.set_params(n_jobs=n_jobs)
+
+    for index in range(done, len(chunks)):
+        start, stop = chunks[index]
+        X_chunk = np.asarray(X[start:stop])
+        if scaler is not None:
+            X_chunk = scaler.transform(X_chunk)
+
+        model.set_params(n_estimators=total_estimators * (index + 1) // len(chunks))
+        model.fit(X_chunk, np.asarray(y[start:stop]))
+
+        joblib.dump({**run, "model": model, "scaler": scaler, "chunks_done": index + 1}, checkpoint_path)
+        logger.info(f"{name}: chunk {index + 1}/{len(chunks)} fitted ({model.n_estimators} estimators)")
+
+    return {
+        "name": name,
+        "checkpoint": checkpoint_path,
+        "chunks": len(chunks),
+        "seconds": time.perf_counter() - started
+    }
+
+
+def _evaluate(scorer: Any, X: np.ndarray, y: np.ndarray, chunk_size: int) -> Dict[str, Dict[str, float]]:
+    """Validation MSE and R2 of each member, computed chunk by chunk"""
+    errors = {name: 0.0 for name in ENSEMBLE_MEMBERS}
+    y_sum = 0.0
+    y_sq_sum = 0.0
+    for start, stop in _chunk_bounds(len(y), chunk_size):
+        X_chunk = np.asarray(X[start:stop])
+        y_chunk = np.asarray(y[start:stop])
+        predictions = {
+            "rf": scorer.models['rf'].predict(X_chunk),
+            "gb": scorer.models['gb'].predict(scorer.scalers['standard'].transform(X_chunk))
+        }
+        for name, y_pred in predictions.items():
+            errors[name] += float(np.sum((y_chunk - y_pred) ** 2))
+        y_sum += float(y_chunk.sum())
+        y_sq_sum += float(np.sum(y_chunk ** 2))
+
+    n = len(y)
+    total_variance = y_sq_sum - y_sum ** 2 / n
+    return {
+        name: {
+            "mse": error / n,
+            "r2": 1 - error / total_variance if total_variance > 0 else 0.0
+        }
+        for name, error in errors.items()
+    }
+
+
+def train_ensemble(
+    X_path: str,
+    y_path: str,
+    workers: int = TRAINING_WORKERS,
+    chunk_size: int = TRAINING_CHUNK_SIZE,
+    validation_fraction: float = TRAINING_VALIDATION_FRACTION,
+    checkpoint_dir: str = TRAINING_CHECKPOINT_DIR,
+    resume: bool = True,
+    scorer: Optional[Any] = None
+) -> Any:
+    """
+    Train the RF + GB ensemble from an on-disk dataset
+
+    Args:
+        X_path: Feature matrix .npy file (FEATURE_COLUMNS order), rows shuffled
+        y_path: Target .npy file
+        workers: Member processes (0 = one per member, 1 = train in this process)
+        chunk_size: Rows per training chunk
+        validation_fraction: Trailing fraction of rows held out for evaluation
+        checkpoint_dir: Directory for per-model checkpoints
+        resume: Continue from compatible checkpoints
+        scorer: MLCredoScorer to train in place (a new one by default)
+
+    Returns:
+        Trained MLCredoScorer
+    """
+    import joblib
+    from .ml_scoring_service import MLCredoScorer
+
+    X = np.load(X_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    if X.ndim != 2 or X.shape[1] != len(FEATURE_COLUMNS) or len(X) != len(y):
+        raise ValueError(f"Dataset shape {X.shape} / {y.shape} does not match the feature set")
+
+    validation_rows = int(len(X) * validation_fraction)
+    train_rows = len(X) - validation_rows
+    if train_rows <= 0:
+        raise ValueError("No training rows left after the validation split")
+
+    workers = min(workers or len(ENSEMBLE_MEMBERS), len(ENSEMBLE_MEMBERS))
+    # Split the CPUs between the concurrent members for the forest's threads
+    rf_jobs = max(1, (os.cpu_count() or 1) // workers)
+    args = {
+        name: (name, X_path, y_path, train_rows, chunk_size, checkpoint_dir, resume, rf_jobs if name == "rf" else 1)
+        for name in ENSEMBLE_MEMBERS
+    }
+
+    logger.info(f"Training on {train_rows} rows ({validation_rows} held out) with {workers} worker(s)")
+    if workers == 1:
+        results = [train_member(*args[name]) for name in ENSEMBLE_MEMBERS]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(train_member, *args[name]) for name in ENSEMBLE_MEMBERS]
+            results = [future.result() for future in futures]
+
+    scorer = scorer or MLCredoScorer()
+    scorer._build_models()
+    scorer.compiled = None
+    for result in results:
+        checkpoint = joblib.load(result["checkpoint"])
+        scorer.models[result["name"]] = checkpoint["model"]
+        if checkpoint["scaler"] is not None:
+            scorer.scalers['standard'] = checkpoint["scaler"]
+        logger.info(f"{result['name']} trained in {result['seconds']:.1f}s over {result['chunks']} chunk(s)")
+
+    scorer.feature_importance['rf'] = dict(zip(FEATURE_COLUMNS, scorer.models['rf'].feature_importances_))
+    scorer.is_trained = True
+    scorer.model_version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    if validation_rows:
+        for name, scores in _evaluate(scorer, X[train_rows:], y[train_rows:], chunk_size).items():
+            logger.info(f"{name} model - MSE: {scores['mse']:.2f}, R2: {scores['r2']:.3f}")
+
+    return scorer
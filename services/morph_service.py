@@ -1,7 +1,7 @@
 import asyncio
 import httpx
 from web3 import Web3
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from datetime import datetime, timezone
 import time
@@ -9,9 +9,22 @@ import json
 import os
 from decimal import Decimal
 
+from .address_snapshot import AddressSnapshot
+from .clients import get_async_web3, get_http_client
+from .concurrency import SingleFlight
+from .etherscan import etherscan_get
+from .multicall import (
+    ETH_TOKEN,
+    batch_call,
+    fetch_balance_matrix,
+    token_balance_read,
+)
+from .token_registry import token_registry
+from .transaction_history import TransactionSummary, fetch_transaction_summary
+
 # Import ML scoring service
 try:
-    from .ml_scoring_service import calculate_ml_enhanced_score, ml_scorer
+    from .ml_scoring_service import calculate_ml_enhanced_score, calculate_ml_enhanced_scores, ml_scorer
     ML_AVAILABLE = True
 except ImportError:
     ML_AVAILABLE = False
@@ -68,17 +81,18 @@ def get_ethereum_rpc():
         return os.getenv("GETBLOCK_API_URL", "https://go.getblock.us/0e6fce785a734c2795acfc4afcab5634")
 
 ETHEREUM_RPC = get_ethereum_rpc()
-ETHERSCAN_API_BASE = "https://api.etherscan.io/api"
 
 # Future: Add more chains
 # POLYGON_RPC = "https://polygon-rpc.com"
 # ARBITRUM_RPC = "https://arb1.arbitrum.io/rpc"
 # MORPH_RPC = "https://rpc-holesky.morphl2.io"
 
-# Initialize Web3 connection to Ethereum mainnet
-w3 = Web3(Web3.HTTPProvider(ETHEREUM_RPC))
+async def get_eth_web3():
+    """Get the shared async Web3 connection to Ethereum mainnet"""
+    return await get_async_web3(ETHEREUM_RPC)
 
 # Common stablecoin addresses (checksummed) - CORRECT MAINNET ADDRESSES
+# Decimals and symbols are resolved through the token registry
 STABLECOINS = {
     "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
     "USDC": "0xA0b86a33E6441b8435b662303c0f479c7e1d5916",  # USDC mainnet
@@ -105,7 +119,183 @@ ERC20_ABI = [
     }
 ]
 
-async def calculate_score(address: str) -> Dict[str, Any]:
+def get_score_model_version() -> str:
+    """
+    Identify the scoring model currently serving requests
+    
+    Used as part of the score cache key so cached results never outlive a
+    model change.
+    """
+    if ML_AVAILABLE:
+        return f"2.1-ML:{ml_scorer.model_version}"
+    return "2.0"
+
+async def warm_token_registry():
+    """Pre-load stablecoin metadata so the first score request skips the lookup"""
+    try:
+        aw3 = await get_eth_web3()
+        await token_registry.warm(aw3, STABLECOINS.values())
+    except Exception as e:
+        logger.warning(f"Token registry warm-up failed, will load lazily: {str(e)}")
+
+async def collect_score_metrics(address: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict[str, Any]]:
+    """
+    Collect the on-chain and explorer metrics used to score a wallet
+    
+    Args:
+        address: Ethereum wallet address to analyze
+        client: HTTP client for explorer APIs (defaults to the shared pooled client)
+        
+    Returns:
+        Metrics dictionary, or None if the wallet should be shown demo data
+    """
+    # SMART DEMO LOGIC: Check if wallet has real activity first
+    logger.info(f"Analyzing address: {address}")
+    
+    # Quick check: Does this wallet have any real transactions?
+    try:
+        # One snapshot per request: every fetch_* coroutine shares its
+        # balance/nonce lookups and reads from the same pinned block
+        aw3 = await get_eth_web3()
+        snapshot = await AddressSnapshot.create(aw3, address)
+        
+        # Check ETH balance and transaction count (nonce) together
+        eth_balance, tx_count = await asyncio.gather(
+            snapshot.get_eth_balance(),
+            snapshot.get_transaction_count()
+        )
+        
+        logger.info(f"Address {address}: ETH balance = {eth_balance}, TX count = {tx_count}")
+        
+        # If wallet has NO activity (0 balance, 0 transactions), show demo data
+        if eth_balance == 0 and tx_count == 0:
+            logger.info(f"🎬 EMPTY WALLET DETECTED: {address} - Showing demo data for presentation")
+            return None
+        
+        # If wallet has minimal activity (very low balance, few transactions), show demo data
+        if eth_balance < 0.001 and tx_count < 5:
+            logger.info(f"🎬 MINIMAL ACTIVITY WALLET: {address} - Showing demo data")
+            return None
+            
+    except Exception as e:
+        logger.warning(f"Error checking wallet activity for {address}: {e}")
+        # If we can't check, show demo data to be safe
+        logger.info(f"🎬 UNABLE TO CHECK WALLET: {address} - Showing demo data")
+        return None
+    
+    # Initialize enhanced metrics for real addresses
+    metrics = {
+        "wallet_age_days": 0,
+        "transaction_count": 0,
+        "eth_balance": 0.0,
+        "liquidation_count": 0,
+        "stablecoin_percentage": 0.0,
+        "balance_stability_score": 0,
+        "total_portfolio_value_usd": 0.0,
+        "first_transaction_timestamp": None,
+        "last_transaction_timestamp": None,
+        "asset_breakdown": {}
+    }
+    
+    # Reuse the application-wide pooled HTTP client
+    if client is None:
+        client = get_http_client()
+    
+    # Current ETH balance (already fetched by the snapshot)
+    metrics["eth_balance"] = eth_balance
+    
+    # Fetch enhanced data concurrently
+    tasks = [
+        fetch_transaction_data(client, address, snapshot),
+        fetch_asset_mix(address, snapshot),
+        fetch_liquidation_history(client, address),
+        calculate_balance_stability(client, address, snapshot)
+    ]
+    
+    tx_data, asset_data, liquidation_data, stability_data = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Process transaction data
+    if isinstance(tx_data, dict):
+        metrics.update(tx_data)
+    
+    # Process asset mix data
+    if isinstance(asset_data, dict):
+        metrics.update(asset_data)
+    
+    # Process liquidation data
+    if isinstance(liquidation_data, dict):
+        metrics.update(liquidation_data)
+    
+    # Process stability data
+    if isinstance(stability_data, dict):
+        metrics.update(stability_data)
+    
+    # Calculate wallet age if we have first transaction
+    if metrics["first_transaction_timestamp"]:
+        first_tx_time = datetime.fromtimestamp(
+            metrics["first_transaction_timestamp"], 
+            tz=timezone.utc
+        )
+        current_time = datetime.now(timezone.utc)
+        wallet_age = (current_time - first_tx_time).days
+        metrics["wallet_age_days"] = max(0, wallet_age)
+    
+    return metrics
+
+def build_score_result(metrics: Dict[str, Any], ml_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Assemble the score response for collected metrics
+    
+    Args:
+        metrics: Metrics from collect_score_metrics
+        ml_result: Result of ML-enhanced scoring (None uses the rule-based score)
+        
+    Returns:
+        Dictionary containing score and detailed metrics breakdown
+    """
+    if ml_result is not None:
+        # Add ML-specific data to response
+        return {
+            "score": ml_result['score'],
+            "metrics": metrics,
+            "ml_analysis": {
+                "ml_score": ml_result.get('ml_score'),
+                "rule_based_score": ml_result.get('rule_based_score'),
+                "confidence": ml_result.get('confidence'),
+                "model_type": ml_result.get('model_type'),
+                "feature_importance": ml_result.get('feature_importance', {}),
+                "advanced_features": ml_result.get('advanced_features', {})
+            },
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "version": "2.1-ML"
+        }
+    
+    # Fallback to rule-based scoring
+    return {
+        "score": calculate_enhanced_credo_score(metrics),
+        "metrics": metrics,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": "2.0"
+    }
+
+def score_error_result(error: Exception) -> Dict[str, Any]:
+    """Default score response returned when a calculation fails"""
+    return {
+        "score": 0,
+        "metrics": {
+            "wallet_age_days": 0,
+            "transaction_count": 0,
+            "eth_balance": 0.0,
+            "liquidation_count": 0,
+            "stablecoin_percentage": 0.0,
+            "balance_stability_score": 0,
+            "error": str(error)
+        },
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": "2.0"
+    }
+
+async def calculate_score(address: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
     """
     Enhanced Credo Score calculation with 5 key signals:
     1. Wallet age
@@ -116,6 +306,7 @@ async def calculate_score(address: str) -> Dict[str, Any]:
     
     Args:
         address: Ethereum wallet address to analyze
+        client: HTTP client for explorer APIs (defaults to the shared pooled client)
         
     Returns:
         Dictionary containing score and detailed metrics breakdown
@@ -123,216 +314,126 @@ async def calculate_score(address: str) -> Dict[str, Any]:
     try:
         logger.info(f"Starting enhanced Credo Score calculation for address: {address}")
         
-        # SMART DEMO LOGIC: Check if wallet has real activity first
-        logger.info(f"Analyzing address: {address}")
-        
-        # Quick check: Does this wallet have any real transactions?
-        try:
-            # Check ETH balance first (quick check)
-            balance_wei = w3.eth.get_balance(address)
-            eth_balance = float(w3.from_wei(balance_wei, 'ether'))
-            
-            # Check transaction count (nonce)
-            tx_count = w3.eth.get_transaction_count(address)
-            
-            logger.info(f"Address {address}: ETH balance = {eth_balance}, TX count = {tx_count}")
-            
-            # If wallet has NO activity (0 balance, 0 transactions), show demo data
-            if eth_balance == 0 and tx_count == 0:
-                logger.info(f"🎬 EMPTY WALLET DETECTED: {address} - Showing demo data for presentation")
-                return await get_demo_score_data(address)
-            
-            # If wallet has minimal activity (very low balance, few transactions), show demo data
-            if eth_balance < 0.001 and tx_count < 5:
-                logger.info(f"🎬 MINIMAL ACTIVITY WALLET: {address} - Showing demo data")
-                return await get_demo_score_data(address)
-                
-        except Exception as e:
-            logger.warning(f"Error checking wallet activity for {address}: {e}")
-            # If we can't check, show demo data to be safe
-            logger.info(f"🎬 UNABLE TO CHECK WALLET: {address} - Showing demo data")
+        metrics = await collect_score_metrics(address, client)
+        if metrics is None:
             return await get_demo_score_data(address)
         
-        # Initialize enhanced metrics for real addresses
-        metrics = {
-            "wallet_age_days": 0,
-            "transaction_count": 0,
-            "eth_balance": 0.0,
-            "liquidation_count": 0,
-            "stablecoin_percentage": 0.0,
-            "balance_stability_score": 0,
-            "total_portfolio_value_usd": 0.0,
-            "first_transaction_timestamp": None,
-            "last_transaction_timestamp": None,
-            "asset_breakdown": {}
-        }
-        
-        # Fetch all metrics concurrently
-        async with httpx.AsyncClient(timeout=45.0) as client:
-            # Get current ETH balance
-            balance_wei = w3.eth.get_balance(address)
-            metrics["eth_balance"] = float(w3.from_wei(balance_wei, 'ether'))
-            
-            # Fetch enhanced data concurrently
-            tasks = [
-                fetch_transaction_data(client, address),
-                fetch_asset_mix(address),
-                fetch_liquidation_history(client, address),
-                calculate_balance_stability(client, address)
-            ]
-            
-            tx_data, asset_data, liquidation_data, stability_data = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process transaction data
-            if isinstance(tx_data, dict):
-                metrics.update(tx_data)
-            
-            # Process asset mix data
-            if isinstance(asset_data, dict):
-                metrics.update(asset_data)
-            
-            # Process liquidation data
-            if isinstance(liquidation_data, dict):
-                metrics.update(liquidation_data)
-            
-            # Process stability data
-            if isinstance(stability_data, dict):
-                metrics.update(stability_data)
-            
-            # Calculate wallet age if we have first transaction
-            if metrics["first_transaction_timestamp"]:
-                first_tx_time = datetime.fromtimestamp(
-                    metrics["first_transaction_timestamp"], 
-                    tz=timezone.utc
-                )
-                current_time = datetime.now(timezone.utc)
-                wallet_age = (current_time - first_tx_time).days
-                metrics["wallet_age_days"] = max(0, wallet_age)
-        
         # Calculate enhanced Credo Score with ML if available
-        if ML_AVAILABLE:
-            ml_result = await calculate_ml_enhanced_score(address, metrics)
-            score = ml_result['score']
-            
-            # Add ML-specific data to response
-            result = {
-                "score": score,
-                "metrics": metrics,
-                "ml_analysis": {
-                    "ml_score": ml_result.get('ml_score'),
-                    "rule_based_score": ml_result.get('rule_based_score'),
-                    "confidence": ml_result.get('confidence'),
-                    "model_type": ml_result.get('model_type'),
-                    "feature_importance": ml_result.get('feature_importance', {}),
-                    "advanced_features": ml_result.get('advanced_features', {})
-                },
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "version": "2.1-ML"
-            }
-        else:
-            # Fallback to rule-based scoring
-            score = calculate_enhanced_credo_score(metrics)
-            result = {
-                "score": score,
-                "metrics": metrics,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "version": "2.0"
-            }
+        ml_result = await calculate_ml_enhanced_score(address, metrics) if ML_AVAILABLE else None
+        result = build_score_result(metrics, ml_result)
         
-        logger.info(f"Enhanced Credo Score calculation completed for {address}: {score}")
+        logger.info(f"Enhanced Credo Score calculation completed for {address}: {result['score']}")
         
         return result
         
     except Exception as e:
         logger.error(f"Error in enhanced calculate_score for {address}: {str(e)}")
         # Return default values on error
-        return {
-            "score": 0,
-            "metrics": {
-                "wallet_age_days": 0,
-                "transaction_count": 0,
-                "eth_balance": 0.0,
-                "liquidation_count": 0,
-                "stablecoin_percentage": 0.0,
-                "balance_stability_score": 0,
-                "error": str(e)
-            },
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "version": "2.0"
-        }
+        return score_error_result(e)
 
-async def fetch_transaction_data(client: httpx.AsyncClient, address: str) -> Dict[str, Any]:
+async def score_metrics_batch(metrics_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Fetch transaction data from Morph Blockscout API
+    Score many wallets from already collected metrics
+    
+    All rows go through a single vectorized model inference, so this is the
+    path for batch endpoints and offline rescoring of stored metrics.
+    
+    Args:
+        metrics_list: Metrics from collect_score_metrics, one per wallet
+        
+    Returns:
+        Score responses in the format of calculate_score, in input order
+    """
+    if not metrics_list:
+        return []
+    
+    if not ML_AVAILABLE:
+        return [build_score_result(metrics) for metrics in metrics_list]
+    
+    # Model inference is CPU-bound, keep it off the event loop
+    ml_results = await asyncio.to_thread(calculate_ml_enhanced_scores, metrics_list)
+    return [build_score_result(metrics, ml_result) for metrics, ml_result in zip(metrics_list, ml_results)]
+
+async def get_transaction_summary(client: httpx.AsyncClient, address: str, snapshot: AddressSnapshot) -> Optional[TransactionSummary]:
+    """
+    Get the transaction history summary for a score request, fetching it at most once
+    
+    Every metric that needs txlist data awaits this, so concurrent consumers
+    share a single streamed Etherscan fetch bounded by the snapshot block.
     
     Args:
         client: HTTP client for making requests
         address: Wallet address to analyze
+        snapshot: Shared address snapshot for the request
         
+    Returns:
+        TransactionSummary, or None if the API call failed
+    """
+    return await snapshot.memoize(
+        "transaction_summary",
+        lambda: fetch_transaction_summary(client, address, endblock=snapshot.block_number)
+    )
+
+async def fetch_transaction_data(client: httpx.AsyncClient, address: str, snapshot: Optional[AddressSnapshot] = None) -> Dict[str, Any]:
+    """
+    Fetch transaction data from Morph Blockscout API
+    
+    Args:
+        client: HTTP client for making requests
+        address: Wallet address to analyze
+        snapshot: Shared address snapshot (created on demand if omitted)
+    
     Returns:
         Dictionary containing transaction metrics
     """
     try:
-        # Get transaction list from Etherscan API
-        params = {
-            "module": "account",
-            "action": "txlist",
-            "address": address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "page": 1,
-            "offset": 1000,
-            "sort": "asc",
-            "apikey": os.getenv("ETHERSCAN_API_KEY", "")
-        }
+        if snapshot is None:
+            snapshot = await AddressSnapshot.create(await get_eth_web3(), address)
         
-        response = await client.get(f"{ETHERSCAN_API_BASE}", params=params)
+        # Stream the full history from Etherscan (shared with other metrics)
+        summary = await get_transaction_summary(client, address, snapshot)
         
-        if response.status_code == 200:
-            data = response.json()
+        if summary and summary.transaction_count > 0:
+            tx_data = summary.to_metrics()
             
-            if data.get("status") == "1" and data.get("result"):
-                transactions = data["result"]
-                tx_count = len(transactions)
-                
-                if tx_count > 0:
-                    # Get first and last transaction timestamps
-                    first_tx = transactions[0]
-                    last_tx = transactions[-1]
-                    
-                    return {
-                        "transaction_count": tx_count,
-                        "first_transaction_timestamp": int(first_tx.get("timeStamp", 0)),
-                        "last_transaction_timestamp": int(last_tx.get("timeStamp", 0))
-                    }
+            # Page budget hit: the nonce is a lower bound on the true count
+            if not summary.complete:
+                nonce = await snapshot.get_transaction_count()
+                tx_data["transaction_count"] = max(tx_data["transaction_count"], nonce)
             
+            return tx_data
+        
         # If API call fails or returns no data, try alternative approach
         logger.warning(f"Etherscan API failed for {address}, using Web3 fallback")
-        return await fetch_transaction_data_web3(address)
-        
+        return await fetch_transaction_data_web3(address, snapshot)
+    
     except Exception as e:
         logger.error(f"Error fetching transaction data from API: {str(e)}")
-        return await fetch_transaction_data_web3(address)
+        return await fetch_transaction_data_web3(address, snapshot)
 
-async def fetch_transaction_data_web3(address: str) -> Dict[str, Any]:
+async def fetch_transaction_data_web3(address: str, snapshot: Optional[AddressSnapshot] = None) -> Dict[str, Any]:
     """
     Fallback method to estimate transaction data using Web3
     
     Args:
         address: Wallet address to analyze
+        snapshot: Shared address snapshot (created on demand if omitted)
         
     Returns:
         Dictionary containing estimated transaction metrics
     """
     try:
+        if snapshot is None:
+            snapshot = await AddressSnapshot.create(await get_eth_web3(), address)
+        
         # Get current nonce as transaction count estimate
-        nonce = w3.eth.get_transaction_count(address)
+        nonce = await snapshot.get_transaction_count()
         
         # For wallet age, we'll use a simple heuristic
         # If nonce > 0, estimate wallet age based on current block and average block time
         wallet_age_days = 0
         if nonce > 0:
-            current_block = w3.eth.block_number
+            current_block = snapshot.block_number
             # Estimate wallet created ~nonce blocks ago (very rough estimate)
             estimated_first_block = max(0, current_block - (nonce * 2))
             # Assume ~12 second block time for age estimation
@@ -353,66 +454,89 @@ async def fetch_transaction_data_web3(address: str) -> Dict[str, Any]:
             "last_transaction_timestamp": None
         }
 
-async def fetch_asset_mix(address: str) -> Dict[str, Any]:
+def summarize_asset_mix(eth_balance_wei: int, token_balances: Dict[str, Tuple[Optional[int], Optional[int]]]) -> Dict[str, Any]:
+    """
+    Build asset mix metrics from raw on-chain balances
+    
+    Args:
+        eth_balance_wei: Native ETH balance in wei
+        token_balances: Mapping of stablecoin symbol -> (raw balance, decimals)
+        
+    Returns:
+        Dictionary containing asset mix data
+    """
+    total_value = 0.0
+    stablecoin_value = 0.0
+    asset_breakdown = {}
+    
+    eth_balance = float(Web3.from_wei(eth_balance_wei or 0, 'ether'))
+    
+    # Use fixed ETH price for demo (realistic current price)
+    eth_price = float(os.getenv("ETH_PRICE_USD", "2500"))
+    eth_value_usd = eth_balance * eth_price
+    total_value += eth_value_usd
+    asset_breakdown["ETH"] = {"balance": eth_balance, "value_usd": eth_value_usd}
+    
+    for symbol, (balance, decimals) in token_balances.items():
+        if balance and decimals is not None:
+            token_balance = balance / (10 ** decimals)
+            # Stablecoins are ~$1 each
+            token_value_usd = token_balance * 1.0
+            
+            total_value += token_value_usd
+            stablecoin_value += token_value_usd
+            asset_breakdown[symbol] = {
+                "balance": token_balance,
+                "value_usd": token_value_usd
+            }
+    
+    # Calculate stablecoin percentage
+    stablecoin_percentage = (stablecoin_value / total_value * 100) if total_value > 0 else 0
+    
+    return {
+        "stablecoin_percentage": round(stablecoin_percentage, 2),
+        "total_portfolio_value_usd": round(total_value, 2),
+        "asset_breakdown": asset_breakdown
+    }
+
+async def fetch_asset_mix(address: str, snapshot: Optional[AddressSnapshot] = None) -> Dict[str, Any]:
     """
     Analyze asset mix to calculate stablecoin percentage
     
+    Stablecoin balances are read in a single Multicall3 aggregate3 call at
+    the snapshot block; token decimals come from the process-wide token
+    registry and the ETH balance from the shared snapshot.
+    
     Args:
         address: Wallet address to analyze
+        snapshot: Shared address snapshot (created on demand if omitted)
         
     Returns:
         Dictionary containing asset mix data
     """
     try:
-        total_value = 0.0
-        stablecoin_value = 0.0
-        asset_breakdown = {}
-        
-        # Get ETH balance
-        eth_balance_wei = w3.eth.get_balance(address)
-        eth_balance = float(w3.from_wei(eth_balance_wei, 'ether'))
-        
-        # Use fixed ETH price for demo (realistic current price)
-        eth_price = float(os.getenv("ETH_PRICE_USD", "2500"))
-        eth_value_usd = eth_balance * eth_price
-        total_value += eth_value_usd
-        asset_breakdown["ETH"] = {"balance": eth_balance, "value_usd": eth_value_usd}
-        
-        # Check stablecoin balances
-        for symbol, contract_address in STABLECOINS.items():
-            try:
-                contract = w3.eth.contract(
-                    address=Web3.to_checksum_address(contract_address),
-                    abi=ERC20_ABI
-                )
-                
-                balance = contract.functions.balanceOf(address).call()
-                decimals = contract.functions.decimals().call()
-                
-                if balance > 0:
-                    token_balance = balance / (10 ** decimals)
-                    # Stablecoins are ~$1 each
-                    token_value_usd = token_balance * 1.0
-                    
-                    total_value += token_value_usd
-                    stablecoin_value += token_value_usd
-                    asset_breakdown[symbol] = {
-                        "balance": token_balance,
-                        "value_usd": token_value_usd
-                    }
-                    
-            except Exception as e:
-                logger.warning(f"Error fetching {symbol} balance for {address}: {str(e)}")
+        aw3 = await get_eth_web3()
+        if snapshot is None:
+            snapshot = await AddressSnapshot.create(aw3, address)
+        
+        symbols = list(STABLECOINS.keys())
+        reads = [token_balance_read(STABLECOINS[symbol], address) for symbol in symbols]
+        
+        metadata, balances, eth_balance_wei = await asyncio.gather(
+            token_registry.get_many(aw3, STABLECOINS.values()),
+            batch_call(aw3, reads, block_identifier=snapshot.block_number),
+            snapshot.get_balance()
+        )
+        
+        token_balances = {}
+        for symbol, balance in zip(symbols, balances):
+            token_metadata = metadata.get(STABLECOINS[symbol])
+            if balance is None or token_metadata is None:
+                logger.warning(f"Error fetching {symbol} balance for {address}")
                 continue
+            token_balances[symbol] = (balance, token_metadata["decimals"])
         
-        # Calculate stablecoin percentage
-        stablecoin_percentage = (stablecoin_value / total_value * 100) if total_value > 0 else 0
-        
-        return {
-            "stablecoin_percentage": round(stablecoin_percentage, 2),
-            "total_portfolio_value_usd": round(total_value, 2),
-            "asset_breakdown": asset_breakdown
-        }
+        return summarize_asset_mix(eth_balance_wei, token_balances)
         
     except Exception as e:
         logger.error(f"Error fetching asset mix for {address}: {str(e)}")
@@ -422,6 +546,37 @@ async def fetch_asset_mix(address: str) -> Dict[str, Any]:
             "asset_breakdown": {}
         }
 
+async def fetch_asset_mix_batch(addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze asset mix for many addresses at once
+    
+    The full N addresses x M stablecoins balance matrix is fetched through
+    Multicall3 in a handful of aggregate3 calls.
+    
+    Args:
+        addresses: Wallet addresses to analyze
+        
+    Returns:
+        Mapping of address -> asset mix data
+    """
+    aw3 = await get_eth_web3()
+    
+    symbols = list(STABLECOINS.keys())
+    tokens = [STABLECOINS[symbol] for symbol in symbols]
+    
+    metadata = await token_registry.get_many(aw3, tokens)
+    matrix = await fetch_balance_matrix(aw3, addresses, tokens)
+    
+    results = {}
+    for address in addresses:
+        row = matrix.get(address, {})
+        token_balances = {
+            symbol: (row.get(token), metadata.get(token, {}).get("decimals"))
+            for symbol, token in zip(symbols, tokens)
+        }
+        results[address] = summarize_asset_mix(row.get(ETH_TOKEN), token_balances)
+    return results
+
 async def fetch_liquidation_history(client: httpx.AsyncClient, address: str) -> Dict[str, Any]:
     """
     Check for liquidation events in transaction history
@@ -446,15 +601,12 @@ async def fetch_liquidation_history(client: httpx.AsyncClient, address: str) ->
             "endblock": 99999999,
             "page": 1,
             "offset": 100,
-            "sort": "desc",
-            "apikey": os.getenv("ETHERSCAN_API_KEY", "")
+            "sort": "desc"
         }
         
-        response = await client.get(f"{ETHERSCAN_API_BASE}", params=params)
+        data = await etherscan_get(client, params)
         
-        if response.status_code == 200:
-            data = response.json()
-            
+        if data is not None:
             if data.get("status") == "1" and data.get("result"):
                 transactions = data["result"]
                 
@@ -462,7 +614,7 @@ async def fetch_liquidation_history(client: httpx.AsyncClient, address: str) ->
                 for tx in transactions:
                     # Check for large outgoing transfers that might be liquidations
                     value = int(tx.get("value", 0))
-                    if value > w3.to_wei(0.1, 'ether'):  # Significant value transfer
+                    if value > Web3.to_wei(0.1, 'ether'):  # Significant value transfer
                         # Additional heuristics could be added here
                         # For now, we'll use a simple approach
                         pass
@@ -480,13 +632,14 @@ async def fetch_liquidation_history(client: httpx.AsyncClient, address: str) ->
             "liquidation_count": 0
         }
 
-async def calculate_balance_stability(client: httpx.AsyncClient, address: str) -> Dict[str, Any]:
+async def calculate_balance_stability(client: httpx.AsyncClient, address: str, snapshot: Optional[AddressSnapshot] = None) -> Dict[str, Any]:
     """
     Calculate balance stability score based on transaction patterns
     
     Args:
         client: HTTP client for API requests
         address: Wallet address to analyze
+        snapshot: Shared address snapshot (created on demand if omitted)
         
     Returns:
         Dictionary containing stability metrics
@@ -494,47 +647,36 @@ async def calculate_balance_stability(client: httpx.AsyncClient, address: str) -
     try:
         stability_score = 50  # Default neutral score
         
-        # Get recent transaction history
-        params = {
-            "module": "account",
-            "action": "txlist",
-            "address": address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "page": 1,
-            "offset": 50,
-            "sort": "desc",
-            "apikey": os.getenv("ETHERSCAN_API_KEY", "")
-        }
+        if snapshot is None:
+            snapshot = await AddressSnapshot.create(await get_eth_web3(), address)
         
-        response = await client.get(f"{ETHERSCAN_API_BASE}", params=params)
+        # Get recent transaction history (shared with fetch_transaction_data)
+        summary = await get_transaction_summary(client, address, snapshot)
         
-        if response.status_code == 200:
-            data = response.json()
+        if summary:
+            # 50 most recent transactions, newest first
+            transactions = summary.recent_transactions()
             
-            if data.get("status") == "1" and data.get("result"):
-                transactions = data["result"]
+            if len(transactions) >= 5:
+                # Analyze transaction patterns for stability
+                values = []
+                for tx in transactions[:20]:  # Look at last 20 transactions
+                    if tx.get("from", "").lower() == address.lower():
+                        # Outgoing transaction
+                        value = int(tx.get("value", 0))
+                        values.append(value)
                 
-                if len(transactions) >= 5:
-                    # Analyze transaction patterns for stability
-                    values = []
-                    for tx in transactions[:20]:  # Look at last 20 transactions
-                        if tx.get("from", "").lower() == address.lower():
-                            # Outgoing transaction
-                            value = int(tx.get("value", 0))
-                            values.append(value)
-                    
-                    if values:
-                        # Calculate coefficient of variation for stability
-                        if len(values) > 1:
-                            mean_val = sum(values) / len(values)
-                            if mean_val > 0:
-                                variance = sum((x - mean_val) ** 2 for x in values) / len(values)
-                                std_dev = variance ** 0.5
-                                cv = std_dev / mean_val
-                                
-                                # Lower coefficient of variation = higher stability
-                                stability_score = max(0, min(100, 100 - (cv * 50)))
+                if values:
+                    # Calculate coefficient of variation for stability
+                    if len(values) > 1:
+                        mean_val = sum(values) / len(values)
+                        if mean_val > 0:
+                            variance = sum((x - mean_val) ** 2 for x in values) / len(values)
+                            std_dev = variance ** 0.5
+                            cv = std_dev / mean_val
+                            
+                            # Lower coefficient of variation = higher stability
+                            stability_score = max(0, min(100, 100 - (cv * 50)))
         
         return {
             "balance_stability_score": round(stability_score, 2)
@@ -546,6 +688,39 @@ async def calculate_balance_stability(client: httpx.AsyncClient, address: str) -
             "balance_stability_score": 50.0
         }
 
+# In-flight score computations, keyed by normalized address
+_score_flights = SingleFlight()
+
+async def calculate_score_shared(address: str) -> Dict[str, Any]:
+    """
+    Calculate a score, sharing the work with concurrent callers
+    
+    Concurrent requests for the same wallet (from any endpoint) await one
+    calculate_score run instead of each repeating the RPC and Etherscan work.
+    
+    Args:
+        address: Ethereum wallet address to analyze
+        
+    Returns:
+        Dictionary containing score and detailed metrics breakdown
+    """
+    return await _score_flights.do(address.lower(), lambda: calculate_score(address))
+
+# In-flight metric collections, keyed by normalized address
+_metrics_flights = SingleFlight()
+
+async def collect_score_metrics_shared(address: str) -> Optional[Dict[str, Any]]:
+    """
+    Collect score metrics, sharing the work with concurrent callers
+    
+    Args:
+        address: Ethereum wallet address to analyze
+    
+    Returns:
+        Metrics dictionary, or None if the wallet should be shown demo data
+    """
+    return await _metrics_flights.do(address.lower(), lambda: collect_score_metrics(address))
+
 def calculate_enhanced_credo_score(metrics: Dict[str, Any]) -> int:
     """
     Calculate enhanced Credo Score using 5 key signals:
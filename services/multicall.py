@@ -0,0 +1,188 @@
+"""
+Multicall3 helpers for batching read-only contract calls
+Aggregates many eth_call reads into a single aggregate3 round trip
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+from web3 import AsyncWeb3, Web3
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on Ethereum mainnet and most L2s
+MULTICALL3_ADDRESS = os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+
+# Maximum number of sub-calls packed into one aggregate3 request
+MULTICALL_BATCH_SIZE = int(os.getenv("MULTICALL_BATCH_SIZE", "500"))
+
+# Pseudo-token key used for native ETH balances in balance matrices
+ETH_TOKEN = "ETH"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# A single read: (target, function signature, argument types, arguments, return types)
+ContractRead = Tuple[str, str, Sequence[str], Sequence[Any], Sequence[str]]
+
+
+def encode_call(signature: str, arg_types: Sequence[str], args: Sequence[Any]) -> bytes:
+    """
+    ABI-encode calldata for a contract function
+
+    Args:
+        signature: Canonical function signature, e.g. "balanceOf(address)"
+        arg_types: ABI types of the arguments
+        args: Argument values
+
+    Returns:
+        Selector followed by the encoded arguments
+    """
+    return function_signature_to_4byte_selector(signature) + encode(list(arg_types), list(args))
+
+
+def _decode_result(success: bool, return_data: bytes, return_types: Sequence[str]) -> Optional[Any]:
+    """Decode one aggregate3 result, returning None for failed or empty calls"""
+    if not success or not return_data:
+        return None
+    try:
+        values = decode(list(return_types), return_data)
+    except Exception:
+        return None
+    return values[0] if len(values) == 1 else values
+
+
+async def batch_call(
+    aw3: AsyncWeb3,
+    reads: List[ContractRead],
+    block_identifier: Any = "latest"
+) -> List[Optional[Any]]:
+    """
+    Execute many read-only calls through Multicall3 aggregate3
+
+    Reads are packed into chunks of MULTICALL_BATCH_SIZE and each chunk is sent
+    as one eth_call. Individual failures are tolerated and yield None.
+
+    Args:
+        aw3: Async Web3 instance for the target chain
+        reads: List of (target, signature, arg_types, args, return_types)
+        block_identifier: Block to execute the reads against
+
+    Returns:
+        Decoded results in the same order as reads
+    """
+    if not reads:
+        return []
+
+    multicall = aw3.eth.contract(
+        address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+        abi=MULTICALL3_ABI
+    )
+
+    calls = [
+        (Web3.to_checksum_address(target), True, encode_call(signature, arg_types, args))
+        for target, signature, arg_types, args, _ in reads
+    ]
+    chunks = [calls[i:i + MULTICALL_BATCH_SIZE] for i in range(0, len(calls), MULTICALL_BATCH_SIZE)]
+
+    chunk_results = await asyncio.gather(*[
+        multicall.functions.aggregate3(chunk).call(block_identifier=block_identifier)
+        for chunk in chunks
+    ])
+
+    results = []
+    for (success, return_data), read in zip(
+        (item for chunk in chunk_results for item in chunk), reads
+    ):
+        results.append(_decode_result(success, return_data, read[4]))
+    return results
+
+
+def eth_balance_read(holder: str) -> ContractRead:
+    """Read native ETH balance via Multicall3.getEthBalance"""
+    return (MULTICALL3_ADDRESS, "getEthBalance(address)", ["address"], [Web3.to_checksum_address(holder)], ["uint256"])
+
+
+def token_balance_read(token: str, holder: str) -> ContractRead:
+    """Read an ERC-20 balanceOf"""
+    return (token, "balanceOf(address)", ["address"], [Web3.to_checksum_address(holder)], ["uint256"])
+
+
+def token_decimals_read(token: str) -> ContractRead:
+    """Read ERC-20 decimals"""
+    return (token, "decimals()", [], [], ["uint8"])
+
+
+async def fetch_balance_matrix(
+    aw3: AsyncWeb3,
+    holders: List[str],
+    tokens: List[str],
+    include_eth: bool = True,
+    block_identifier: Any = "latest"
+) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    Fetch raw balances for N holders x M tokens in as few calls as possible
+
+    Args:
+        aw3: Async Web3 instance for the target chain
+        holders: Wallet addresses to query
+        tokens: ERC-20 token contract addresses
+        include_eth: Also include native ETH balances under the "ETH" key
+        block_identifier: Block to read balances at
+
+    Returns:
+        Mapping of holder -> {token address or "ETH": raw balance or None}
+    """
+    reads = []
+    keys = []
+    for holder in holders:
+        if include_eth:
+            reads.append(eth_balance_read(holder))
+            keys.append((holder, ETH_TOKEN))
+        for token in tokens:
+            reads.append(token_balance_read(token, holder))
+            keys.append((holder, token))
+
+    values = await batch_call(aw3, reads, block_identifier=block_identifier)
+
+    matrix: Dict[str, Dict[str, Optional[int]]] = {holder: {} for holder in holders}
+    for (holder, token), value in zip(keys, values):
+        matrix[holder][token] = value
+    return matrix
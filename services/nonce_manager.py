@@ -0,0 +1,82 @@
+"""
+Local transaction nonce allocation for an account that sends concurrently
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fragments of node error messages that mean the nonce we used was wrong
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced"
+)
+
+# Fragments of node error messages that mean the node already has this exact
+# transaction (e.g. a resend); the send succeeded under the original hash
+ALREADY_KNOWN_MARKERS = (
+    "already known",
+    "known transaction"
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Check whether a send failure was caused by a stale or conflicting nonce"""
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """Check whether a send was rejected only because the node already has the transaction"""
+    message = str(error).lower()
+    return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+
+class NonceManager:
+    """
+    Hands out consecutive transaction nonces without an RPC call per send
+
+    The counter is seeded from the account's pending transaction count and
+    then incremented locally under a lock, so concurrent submissions never
+    share a nonce. After a failed send the counter is rolled back (if the
+    nonce was the last one handed out) or reseeded from the chain.
+    """
+
+    def __init__(self, fetch_pending_nonce: Callable[[], Awaitable[int]]):
+        self._fetch_pending_nonce = fetch_pending_nonce
+        self._next: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> int:
+        """Reserve the next nonce"""
+        async with self._lock:
+            if self._next is None:
+                self._next = await self._fetch_pending_nonce()
+                logger.info(f"Nonce manager seeded at {self._next}")
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    async def release(self, nonce: int):
+        """
+        Give back a nonce whose transaction was never accepted
+
+        Args:
+            nonce: Nonce returned by allocate()
+        """
+        async with self._lock:
+            if self._next is not None and self._next == nonce + 1:
+                # Nothing was allocated after it, so simply reuse it
+                self._next = nonce
+            else:
+                # A later nonce is already out; reseed to close the gap
+                self._next = None
+
+    async def resync(self):
+        """Drop the local counter so the next allocation re-reads the chain"""
+        async with self._lock:
+            self._next = None
@@ -6,13 +6,19 @@ import asyncio
 from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
-import json
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
 
+from .clients import get_async_web3
+from .fee_strategy import FeeStrategy
+from .multicall import batch_call
+from .nonce_manager import NonceManager, is_already_known, is_nonce_error
+from .receipt_tracker import TX_STATUS_CONFIRMED, TX_STATUS_FAILED, ReceiptTracker
+from .signing_pipeline import SigningPipeline, batch_update_digest
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,10 @@ SCORE_ORACLE_ADDRESS = os.getenv("SCORE_ORACLE_ADDRESS", "")
 SCORE_REGISTRY_ADDRESS = os.getenv("SCORE_REGISTRY_ADDRESS", "")
 ORACLE_PRIVATE_KEY = os.getenv("ORACLE_PRIVATE_KEY", "")
 
+# ScoreOracle.submitBatchScoreUpdate accepts at most this many users per call
+MAX_ORACLE_BATCH_SIZE = 100
+ORACLE_BATCH_SIZE = min(int(os.getenv("ORACLE_BATCH_SIZE", "100")), MAX_ORACLE_BATCH_SIZE)
+
 # Initialize Web3
 w3 = Web3(Web3.HTTPProvider(MORPH_HOLESKY_RPC))
 
@@ -72,6 +82,33 @@ SCORE_ORACLE_ABI = [
         "outputs": [{"name": "", "type": "bytes32"}],
         "stateMutability": "pure",
         "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "users", "type": "address[]"},
+            {"name": "scores", "type": "uint256[]"},
+            {"name": "version", "type": "uint256"},
+            {"name": "batchNonce", "type": "uint256"},
+            {"name": "deadline", "type": "uint256"},
+            {"name": "signature", "type": "bytes"}
+        ],
+        "name": "submitBatchScoreUpdate",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "users", "type": "address[]"},
+            {"name": "scores", "type": "uint256[]"},
+            {"name": "version", "type": "uint256"},
+            {"name": "batchNonce", "type": "uint256"},
+            {"name": "deadline", "type": "uint256"}
+        ],
+        "name": "getBatchUpdateHash",
+        "outputs": [{"name": "", "type": "bytes32"}],
+        "stateMutability": "pure",
+        "type": "function"
     }
 ]
 
@@ -82,9 +119,22 @@ class OracleService:
         self.w3 = w3
         self.account = None
         self.oracle_contract = None
+        self.nonce_manager = None
+        self.batch_nonce_manager = None
+        self.signing_pipeline = None
+        # Batch nonces must reach the chain in the order they were signed
+        self._batch_lock = asyncio.Lock()
+        # Receipts are polled in the background instead of awaited per submission
+        self.receipt_tracker = ReceiptTracker(MORPH_HOLESKY_RPC)
+        # Cached fee data and per-shape gas limits
+        self.fee_strategy = FeeStrategy(self.w3)
         
         if ORACLE_PRIVATE_KEY:
             self.account = Account.from_key(ORACLE_PRIVATE_KEY)
+            # Transaction nonces are allocated locally so concurrent sends never collide
+            self.nonce_manager = NonceManager(lambda: asyncio.to_thread(
+                self.w3.eth.get_transaction_count, self.account.address, "pending"
+            ))
             logger.info(f"Oracle account initialized: {self.account.address}")
         
         if SCORE_ORACLE_ADDRESS:
@@ -93,6 +143,37 @@ class OracleService:
                 abi=SCORE_ORACLE_ABI
             )
             logger.info(f"Oracle contract initialized: {SCORE_ORACLE_ADDRESS}")
+        
+        if self.account and self.oracle_contract:
+            # The oracle's batch nonce for our account, allocated locally like tx nonces
+            self.batch_nonce_manager = NonceManager(lambda: asyncio.to_thread(
+                self.oracle_contract.functions.getCurrentNonce(self.account.address).call
+            ))
+            # Bulk signing with per-user oracle nonces cached locally
+            self.signing_pipeline = SigningPipeline(self.account.key, self.fetch_oracle_nonces)
+    
+    async def fetch_oracle_nonces(self, users: List[str]) -> List[int]:
+        """Read the oracle nonces of many users through Multicall3"""
+        aw3 = await get_async_web3(MORPH_HOLESKY_RPC)
+        try:
+            nonces = await batch_call(aw3, [
+                (SCORE_ORACLE_ADDRESS, "getCurrentNonce(address)", ["address"], [user], ["uint256"])
+                for user in users
+            ])
+        except Exception as e:
+            logger.warning(f"Multicall nonce read failed, falling back to single calls: {str(e)}")
+            nonces = [None] * len(users)
+        
+        # Individual reads for anything the multicall could not answer
+        missing = [i for i, nonce in enumerate(nonces) if nonce is None]
+        if missing:
+            contract = aw3.eth.contract(address=Web3.to_checksum_address(SCORE_ORACLE_ADDRESS), abi=SCORE_ORACLE_ABI)
+            fetched = await asyncio.gather(*[
+                contract.functions.getCurrentNonce(users[i]).call() for i in missing
+            ])
+            for i, nonce in zip(missing, fetched):
+                nonces[i] = nonce
+        return nonces
     
     def _create_score_update_message(self, user: str, score: int, version: int, nonce: int, deadline: int) -> str:
         """Create the message to be signed for score updates"""
@@ -158,6 +239,136 @@ class OracleService:
             logger.error(f"Error signing score update: {str(e)}")
             raise
     
+    @staticmethod
+    def _create_batch_update_hash(users: List[str], scores: List[int], version: int, batch_nonce: int, deadline: int) -> bytes:
+        """Hash a batch update exactly like ScoreOracle._verifyBatchUpdateSignature"""
+        return batch_update_digest(users, scores, version, batch_nonce, deadline)
+    
+    def sign_batch_score_update(
+        self,
+        users: List[str],
+        scores: List[int],
+        version: int = 2,
+        deadline_minutes: int = 60,
+        batch_nonce: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Sign a batch of score updates for submitBatchScoreUpdate
+        
+        The batch nonce is the oracle nonce of the submitting account
+        (the contract checks nonces[msg.sender]).
+        
+        Args:
+            users: User addresses to update (at most 100)
+            scores: Credo scores (0-1000), one per user
+            version: Algorithm version
+            deadline_minutes: How many minutes until signature expires
+            batch_nonce: Batch nonce to sign (read from the contract if omitted)
+            
+        Returns:
+            Dictionary containing signed batch data
+        """
+        if not self.account or not self.oracle_contract:
+            raise ValueError("Oracle service not properly initialized")
+        if len(users) != len(scores):
+            raise ValueError("users and scores must have the same length")
+        if not 0 < len(users) <= MAX_ORACLE_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_ORACLE_BATCH_SIZE}")
+        
+        try:
+            users = [Web3.to_checksum_address(user) for user in users]
+            scores = [int(score) for score in scores]
+            
+            # Batch nonces are tracked per submitting account
+            if batch_nonce is None:
+                batch_nonce = self.oracle_contract.functions.getCurrentNonce(self.account.address).call()
+            
+            # Calculate deadline timestamp
+            deadline = int(datetime.now(timezone.utc).timestamp()) + (deadline_minutes * 60)
+            
+            message_data = self._create_batch_update_hash(users, scores, version, batch_nonce, deadline)
+            signature = self.account.sign_message(encode_defunct(message_data))
+            
+            return {
+                "update": {
+                    "users": users,
+                    "scores": scores,
+                    "version": version,
+                    "nonce": batch_nonce,
+                    "deadline": deadline
+                },
+                "signature": signature.signature.hex(),
+                "signer": self.account.address
+            }
+            
+        except Exception as e:
+            logger.error(f"Error signing batch score update: {str(e)}")
+            raise
+    
+    async def sign_score_updates(self, score_updates: List[Dict[str, Any]], version: int = 2, deadline_minutes: int = 60) -> List[Dict[str, Any]]:
+        """
+        Sign many single score updates without a nonce RPC call per user
+        
+        Args:
+            score_updates: List of dicts with 'user' and 'score' keys
+            version: Algorithm version
+            deadline_minutes: How many minutes until signatures expire
+        
+        Returns:
+            Signed updates in the same format as sign_score_update
+        """
+        if not self.signing_pipeline:
+            raise ValueError("Oracle service not properly initialized")
+        return await self.signing_pipeline.sign_score_updates(score_updates, version, deadline_minutes)
+    
+    def _sign_and_send(self, contract_call, tx_params: Dict[str, Any]):
+        """Build, sign and broadcast a contract transaction (blocking)"""
+        # Gas, fees, chain id and nonce are all provided, so this makes no RPC calls
+        transaction = contract_call.build_transaction({
+            'from': self.account.address,
+            **tx_params
+        })
+        signed_txn = self.account.sign_transaction(transaction)
+        try:
+            return self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception as e:
+            if is_already_known(e):
+                # The node already has this exact transaction, so it was sent
+                logger.info(f"Transaction {signed_txn.hash.hex()} already known to the node")
+                return signed_txn.hash
+            raise
+    
+    async def _send_transaction(self, contract_call, method: str, users: int):
+        """
+        Send a contract transaction with a locally allocated nonce
+        
+        Fees and the gas limit come from the fee strategy cache. A send
+        rejected because of its nonce is retried once after resyncing the
+        nonce manager with the chain.
+        
+        Args:
+            contract_call: Bound contract function to call
+            method: Contract method name, used to size the gas limit
+            users: Number of users the call updates
+        
+        Returns:
+            Transaction hash
+        """
+        tx_params = await self.fee_strategy.transaction_fields(method, users, contract_call, self.account.address)
+        for attempt in range(2):
+            nonce = await self.nonce_manager.allocate()
+            try:
+                return await asyncio.to_thread(self._sign_and_send, contract_call, {**tx_params, 'nonce': nonce})
+            except Exception as e:
+                if is_nonce_error(e):
+                    await self.nonce_manager.resync()
+                    if attempt == 0:
+                        logger.warning(f"Nonce {nonce} rejected, resyncing and retrying: {str(e)}")
+                        continue
+                else:
+                    await self.nonce_manager.release(nonce)
+                raise
+    
     async def submit_score_update(self, user: str, score: int, version: int = 2) -> Dict[str, Any]:
         """
         Sign and submit a score update to the oracle contract
@@ -168,11 +379,12 @@ class OracleService:
             version: Algorithm version
             
         Returns:
-            Transaction receipt
+            Pending transaction record (poll get_transaction_status for the receipt)
         """
         try:
-            # Sign the update
-            signed_update = self.sign_score_update(user, score, version)
+            # Sign the update (oracle nonce served from the local cache)
+            signed_update = (await self.sign_score_updates([{"user": user, "score": score}], version))[0]
+            signed_user = signed_update["update"]["user"]
             
             # Prepare transaction
             update_tuple = (
@@ -183,30 +395,30 @@ class OracleService:
                 signed_update["update"]["deadline"]
             )
             
-            # Build transaction
-            transaction = self.oracle_contract.functions.submitScoreUpdate(
+            # Build, sign and send transaction
+            contract_call = self.oracle_contract.functions.submitScoreUpdate(
                 update_tuple,
                 bytes.fromhex(signed_update["signature"][2:])  # Remove 0x prefix
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address)
-            })
-            
-            # Sign and send transaction
-            signed_txn = self.account.sign_transaction(transaction)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            )
+            try:
+                tx_hash = await self._send_transaction(contract_call, "submitScoreUpdate", 1)
+            except Exception:
+                self.signing_pipeline.nonce_cache.invalidate([signed_user])
+                raise
             
-            # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            # Track confirmation in the background; a failed update invalidates the cached nonce
+            record = self.receipt_tracker.track(
+                tx_hash,
+                {"user": user, "score": score},
+                on_complete=lambda r: self._on_update_complete(signed_user, r)
+            )
             
-            logger.info(f"Score update submitted for {user}: score={score}, tx={tx_hash.hex()}")
+            logger.info(f"Score update submitted for {user}: score={score}, tx={record['transaction_hash']}")
             
             return {
                 "success": True,
-                "transaction_hash": tx_hash.hex(),
-                "gas_used": receipt.gasUsed,
+                "status": record["status"],
+                "transaction_hash": record["transaction_hash"],
                 "user": user,
                 "score": score
             }
@@ -220,9 +432,126 @@ class OracleService:
                 "score": score
             }
     
+    async def submit_batch_score_update(self, users: List[str], scores: List[int], version: int = 2) -> Dict[str, Any]:
+        """
+        Sign and submit up to 100 score updates in one submitBatchScoreUpdate transaction
+        
+        Args:
+            users: User addresses to update
+            scores: Credo scores (0-1000), one per user
+            version: Algorithm version
+            
+        Returns:
+            Pending transaction record for the batch
+        """
+        try:
+            if not self.batch_nonce_manager:
+                raise ValueError("Oracle service not properly initialized")
+            
+            async with self._batch_lock:
+                batch_nonce = await self.batch_nonce_manager.allocate()
+                try:
+                    signed_batch = await asyncio.to_thread(
+                        self.sign_batch_score_update, users, scores, version, 60, batch_nonce
+                    )
+                    update = signed_batch["update"]
+                    
+                    # Build, sign and send transaction
+                    contract_call = self.oracle_contract.functions.submitBatchScoreUpdate(
+                        update["users"],
+                        update["scores"],
+                        update["version"],
+                        update["nonce"],
+                        update["deadline"],
+                        bytes.fromhex(signed_batch["signature"][2:])  # Remove 0x prefix
+                    )
+                    tx_hash = await self._send_transaction(contract_call, "submitBatchScoreUpdate", len(users))
+                except Exception:
+                    await self.batch_nonce_manager.release(batch_nonce)
+                    raise
+            
+            # Track confirmation in the background; a reverted batch invalidates the batch nonce
+            record = self.receipt_tracker.track(
+                tx_hash,
+                {"batch_size": len(users), "batch_nonce": batch_nonce},
+                on_complete=self._on_batch_complete
+            )
+            
+            logger.info(f"Batch score update submitted for {len(users)} users, tx={record['transaction_hash']}")
+            
+            return {
+                "success": True,
+                "status": record["status"],
+                "transaction_hash": record["transaction_hash"],
+                "batch_size": len(users),
+                "batch_nonce": batch_nonce,
+                "users": update["users"],
+                "scores": update["scores"]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error submitting batch score update: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "batch_size": len(users),
+                "users": users,
+                "scores": scores
+            }
+    
+    def _on_update_complete(self, user: str, record: Dict[str, Any]):
+        """Drop the cached oracle nonce of a user whose update did not execute"""
+        if record["status"] == TX_STATUS_FAILED:
+            # A reverted update may have run out of gas
+            self.fee_strategy.invalidate_gas("submitScoreUpdate", 1)
+        if record["status"] != TX_STATUS_CONFIRMED:
+            self.signing_pipeline.nonce_cache.invalidate([user])
+    
+    def _on_batch_complete(self, record: Dict[str, Any]):
+        """Resync the batch nonce when a batch did not execute"""
+        if record["status"] == TX_STATUS_FAILED:
+            # A reverted batch may have run out of gas
+            self.fee_strategy.invalidate_gas("submitBatchScoreUpdate", record["batch_size"])
+        if record["status"] != TX_STATUS_CONFIRMED:
+            logger.warning(f"Batch {record['transaction_hash']} {record['status']}, resyncing batch nonce")
+            asyncio.ensure_future(self.batch_nonce_manager.resync())
+    
+    async def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        """
+        Get the confirmation status of an oracle transaction
+        
+        Args:
+            tx_hash: Transaction hash returned by a submission
+        
+        Returns:
+            Transaction record with status, block number and gas used once mined
+        """
+        return await self.receipt_tracker.status(tx_hash)
+    
+    async def wait_for_transactions(self, tx_hashes: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Wait for submitted transactions to be mined without blocking the event loop
+        
+        Args:
+            tx_hashes: Transaction hashes returned by submissions
+            timeout: Optional limit in seconds per transaction
+        
+        Returns:
+            Transaction records in the same order
+        """
+        return await asyncio.gather(*[
+            self.receipt_tracker.wait(tx_hash, timeout) for tx_hash in tx_hashes
+        ])
+    
     async def batch_submit_scores(self, score_updates: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Submit multiple score updates in batch
+        Submit multiple score updates as batch transactions
+        
+        Updates are chunked into submitBatchScoreUpdate calls of up to
+        ORACLE_BATCH_SIZE users (fewer if a worst-case batch of that size
+        would not fit in a block), each covered by a single signature. All
+        batches are broadcast without waiting for the previous one to be
+        mined; receipts are tracked in the background.
         
         Args:
             score_updates: List of dicts with 'user' and 'score' keys
@@ -231,32 +560,48 @@ class OracleService:
             Batch submission result
         """
         try:
+            batches = []
             results = []
             
-            # Process in batches of 10 to avoid gas limits
-            batch_size = 10
+            batch_size = ORACLE_BATCH_SIZE
+            max_users = await self.fee_strategy.max_batch_users()
+            if max_users is not None and max_users < batch_size:
+                logger.info(f"Splitting batches to {max_users} users to fit the block gas limit")
+                batch_size = max_users
+            
+            # Batch nonces are allocated in send order, so batches can be pipelined
             for i in range(0, len(score_updates), batch_size):
-                batch = score_updates[i:i + batch_size]
+                chunk = score_updates[i:i + batch_size]
+                batch_result = await self.submit_batch_score_update(
+                    [update["user"] for update in chunk],
+                    [update["score"] for update in chunk]
+                )
+                batches.append(batch_result)
                 
-                # Submit each update in the batch
-                batch_results = await asyncio.gather(*[
-                    self.submit_score_update(update["user"], update["score"])
-                    for update in batch
-                ], return_exceptions=True)
-                
-                results.extend(batch_results)
-                
-                # Small delay between batches to avoid overwhelming the network
-                if i + batch_size < len(score_updates):
-                    await asyncio.sleep(2)
+                for update in chunk:
+                    result = {
+                        "success": batch_result["success"],
+                        "user": update["user"],
+                        "score": update["score"]
+                    }
+                    if "transaction_hash" in batch_result:
+                        result["transaction_hash"] = batch_result["transaction_hash"]
+                    if "error" in batch_result:
+                        result["error"] = batch_result["error"]
+                    results.append(result)
             
-            successful = sum(1 for r in results if isinstance(r, dict) and r.get("success"))
+            successful = sum(1 for r in results if r.get("success"))
             
             return {
                 "success": True,
                 "total_updates": len(score_updates),
                 "successful_updates": successful,
                 "failed_updates": len(score_updates) - successful,
+                "total_batches": len(batches),
+                "batches": [
+                    {k: v for k, v in b.items() if k not in ("users", "scores")}
+                    for b in batches
+                ],
                 "results": results
             }
             
@@ -268,6 +613,12 @@ class OracleService:
                 "total_updates": len(score_updates)
             }
 
+    async def close(self):
+        """Stop receipt polling and the signing pool"""
+        await self.receipt_tracker.stop()
+        if self.signing_pipeline:
+            self.signing_pipeline.close()
+
 # Global oracle service instance
 oracle_service = OracleService()
 
@@ -293,6 +644,18 @@ async def batch_submit_scores_to_oracle(score_updates: List[Dict[str, Any]]) ->
         score_updates: List of score update dictionaries
         
     Returns:
-        Batch submission result
+            Batch submission result
+    """
+    return await oracle_service.batch_submit_scores(score_updates)
+
+async def get_oracle_transaction_status(tx_hash: str) -> Dict[str, Any]:
+    """
+    Convenience function to look up an oracle transaction's status
+    
+    Args:
+        tx_hash: Transaction hash
+    
+    Returns:
+        Transaction record
     """
-    return await oracle_service.batch_submit_scores(score_updates)
\ No newline at end of file
+    return await oracle_service.get_transaction_status(tx_hash)
\ No newline at end of file
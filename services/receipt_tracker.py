@@ -0,0 +1,248 @@
+"""
+Non-blocking receipt tracking for submitted transactions
+A background poller looks up the receipts of every pending transaction in a
+single JSON-RPC batch request per interval
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .clients import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds between receipt polls while transactions are pending
+ORACLE_RECEIPT_POLL_SECONDS = float(os.getenv("ORACLE_RECEIPT_POLL_SECONDS", "2"))
+# Pending transactions without a receipt after this long are marked "timeout"
+ORACLE_RECEIPT_TIMEOUT_SECONDS = float(os.getenv("ORACLE_RECEIPT_TIMEOUT_SECONDS", "600"))
+# Number of finished transactions kept for status lookups
+ORACLE_RECEIPT_HISTORY = int(os.getenv("ORACLE_RECEIPT_HISTORY", "10000"))
+
+TX_STATUS_PENDING = "pending"
+TX_STATUS_CONFIRMED = "confirmed"
+TX_STATUS_FAILED = "failed"
+TX_STATUS_TIMEOUT = "timeout"
+
+
+def normalize_tx_hash(tx_hash: Any) -> str:
+    """Return a transaction hash as a lowercase 0x-prefixed hex string"""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        tx_hash = bytes(tx_hash).hex()
+    tx_hash = str(tx_hash).lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+class ReceiptTracker:
+    """
+    Tracks submitted transactions until they are mined
+
+    track() registers a hash and returns immediately; the poller runs only
+    while something is pending and resolves every pending hash with one
+    batched eth_getTransactionReceipt request.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        poll_interval: float = ORACLE_RECEIPT_POLL_SECONDS,
+        timeout: float = ORACLE_RECEIPT_TIMEOUT_SECONDS,
+        history: int = ORACLE_RECEIPT_HISTORY
+    ):
+        self.rpc_url = rpc_url
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.history = history
+        self.latest_block: Optional[int] = None
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._callbacks: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    def track(
+        self,
+        tx_hash: Any,
+        metadata: Optional[Dict[str, Any]] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Start tracking a submitted transaction
+
+        Args:
+            tx_hash: Transaction hash
+            metadata: Extra fields stored with the record (e.g. user, batch size)
+            on_complete: Optional callback invoked with the final record
+
+        Returns:
+            The pending record
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        record = {
+            **(metadata or {}),
+            "transaction_hash": tx_hash,
+            "status": TX_STATUS_PENDING,
+            "submitted_at": time.time()
+        }
+        self._records[tx_hash] = record
+        if on_complete is not None:
+            self._callbacks[tx_hash] = on_complete
+        self._ensure_poller()
+        return dict(record)
+
+    def get(self, tx_hash: Any) -> Optional[Dict[str, Any]]:
+        """Current record of a tracked transaction (None if unknown)"""
+        record = self._records.get(normalize_tx_hash(tx_hash))
+        if record is None:
+            return None
+        record = dict(record)
+        if record.get("block_number") is not None and self.latest_block is not None:
+            record["confirmations"] = max(0, self.latest_block - record["block_number"] + 1)
+        return record
+
+    async def status(self, tx_hash: Any) -> Dict[str, Any]:
+        """
+        Status of a transaction, looked up on chain if it is not tracked
+
+        Args:
+            tx_hash: Transaction hash
+
+        Returns:
+            Transaction record ("unknown" status if no receipt exists)
+        """
+        record = self.get(tx_hash)
+        if record is not None:
+            return record
+
+        tx_hash = normalize_tx_hash(tx_hash)
+        receipts = await self._fetch_receipts([tx_hash])
+        receipt = receipts.get(tx_hash)
+        if receipt is None:
+            return {"transaction_hash": tx_hash, "status": "unknown"}
+        return {"transaction_hash": tx_hash, **self._receipt_fields(receipt)}
+
+    async def wait(self, tx_hash: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait until a tracked transaction is mined, fails or times out
+
+        Args:
+            tx_hash: Transaction hash previously passed to track()
+            timeout: Optional limit in seconds; the pending record is returned when it expires
+
+        Returns:
+            Transaction record
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        record = self._records.get(tx_hash)
+        if record is None or record["status"] != TX_STATUS_PENDING:
+            return self.get(tx_hash)
+
+        future = self._waiters.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[tx_hash] = future
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(tx_hash)
+
+    async def stop(self):
+        """Stop the background poller"""
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    def _pending_hashes(self) -> List[str]:
+        return [tx_hash for tx_hash, record in self._records.items() if record["status"] == TX_STATUS_PENDING]
+
+    async def _poll_loop(self):
+        while self._pending_hashes():
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.warning(f"Error polling transaction receipts: {str(e)}")
+
+    async def _fetch_receipts(self, tx_hashes: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up receipts (and the latest block) in one JSON-RPC batch request"""
+        payload = [{"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}]
+        payload.extend(
+            {"jsonrpc": "2.0", "id": i + 1, "method": "eth_getTransactionReceipt", "params": [tx_hash]}
+            for i, tx_hash in enumerate(tx_hashes)
+        )
+
+        response = await get_http_client().post(self.rpc_url, json=payload)
+        response.raise_for_status()
+        replies = {reply.get("id"): reply for reply in response.json()}
+
+        block_reply = replies.get(0, {})
+        if block_reply.get("result"):
+            self.latest_block = int(block_reply["result"], 16)
+
+        return {
+            tx_hash: replies.get(i + 1, {}).get("result")
+            for i, tx_hash in enumerate(tx_hashes)
+        }
+
+    @staticmethod
+    def _receipt_fields(receipt: Dict[str, Any]) -> Dict[str, Any]:
+        succeeded = int(receipt.get("status", "0x0"), 16) == 1
+        fields = {
+            "status": TX_STATUS_CONFIRMED if succeeded else TX_STATUS_FAILED,
+            "block_number": int(receipt["blockNumber"], 16),
+            "gas_used": int(receipt["gasUsed"], 16)
+        }
+        if receipt.get("effectiveGasPrice"):
+            fields["effective_gas_price"] = int(receipt["effectiveGasPrice"], 16)
+        return fields
+
+    async def _poll_once(self):
+        pending = self._pending_hashes()
+        if not pending:
+            return
+
+        receipts = await self._fetch_receipts(pending)
+        now = time.time()
+
+        for tx_hash in pending:
+            record = self._records[tx_hash]
+            receipt = receipts.get(tx_hash)
+            if receipt is not None:
+                record.update(self._receipt_fields(receipt))
+                record["confirmed_at"] = now
+                logger.info(f"Transaction {tx_hash} {record['status']} in block {record['block_number']}, gas used {record['gas_used']}")
+            elif now - record["submitted_at"] > self.timeout:
+                record["status"] = TX_STATUS_TIMEOUT
+                logger.warning(f"No receipt for {tx_hash} after {self.timeout}s")
+            else:
+                continue
+            self._finish(tx_hash)
+
+        self._trim_history()
+
+    def _finish(self, tx_hash: str):
+        record = self.get(tx_hash)
+        future = self._waiters.pop(tx_hash, None)
+        if future is not None and not future.done():
+            future.set_result(record)
+        callback = self._callbacks.pop(tx_hash, None)
+        if callback is not None:
+            try:
+                callback(record)
+            except Exception as e:
+                logger.warning(f"Receipt callback failed for {tx_hash}: {str(e)}")
+
+    def _trim_history(self):
+        excess = len(self._records) - self.history
+        if excess <= 0:
+            return
+        for tx_hash in [h for h, r in self._records.items() if r["status"] != TX_STATUS_PENDING][:excess]:
+            del self._records[tx_hash]
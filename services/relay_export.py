@@ -0,0 +1,210 @@
+"""
+Signed score-update export for relayers
+Produces a stream of signed oracle updates (JSONL or ABI-encoded calldata)
+that partners can submit on-chain themselves, paying their own gas. Only
+scores computed by this service are signed, and only for registered relayers
+"""
+
+import hmac
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from web3 import Web3
+
+from .batch_scoring import iter_batch_scores
+from .multicall import encode_call
+from .oracle_service import ORACLE_BATCH_SIZE, SCORE_ORACLE_ADDRESS, oracle_service
+from .signing_pipeline import OracleNonceCache
+
+logger = logging.getLogger(__name__)
+
+# Updates scored and signed together before their lines are emitted
+ORACLE_EXPORT_CHUNK_SIZE = int(os.getenv("ORACLE_EXPORT_CHUNK_SIZE", "1000"))
+# Longest signature validity an export may request (exported signatures cannot be revoked)
+ORACLE_EXPORT_MAX_DEADLINE_MINUTES = int(os.getenv("ORACLE_EXPORT_MAX_DEADLINE_MINUTES", "1440"))
+# Highest score algorithm version an export may sign
+ORACLE_EXPORT_MAX_VERSION = int(os.getenv("ORACLE_EXPORT_MAX_VERSION", "255"))
+
+EXPORT_FORMATS = ("jsonl", "calldata")
+EXPORT_MODES = ("single", "batch")
+
+
+
+def get_export_relayers() -> Dict[str, str]:
+    """
+    Get registered relayers from ORACLE_EXPORT_RELAYERS
+
+    The variable holds comma-separated api_key:submitter_address pairs; the
+    submitter is the account that relayer sends batch transactions from.
+    Export is disabled when no relayer is registered.
+
+    Returns:
+        Dict of API key -> checksum submitter address
+    """
+    relayers = {}
+    for entry in os.getenv("ORACLE_EXPORT_RELAYERS", "").split(","):
+        key, _, address = entry.strip().partition(":")
+        if not key or not address:
+            continue
+        try:
+            relayers[key] = Web3.to_checksum_address(address.strip())
+        except ValueError:
+            logger.error(f"Ignoring relayer with invalid submitter address: {address}")
+    return relayers
+
+
+# Registered relayers (API key -> submitter address)
+export_relayers = get_export_relayers()
+
+
+def authenticate_relayer(api_key: Optional[str]) -> Optional[str]:
+    """
+    Look up the relayer owning an API key
+
+    Args:
+        api_key: Key sent by the caller
+
+    Returns:
+        The relayer's submitter address, or None if the key is not registered
+    """
+    if not api_key:
+        return None
+    for key, submitter in export_relayers.items():
+        if hmac.compare_digest(key.encode(), api_key.encode()):
+            return submitter
+    return None
+
+
+SUBMIT_SCORE_UPDATE_SIGNATURE = "submitScoreUpdate((address,uint256,uint256,uint256,uint256),bytes)"
+SUBMIT_BATCH_SCORE_UPDATE_SIGNATURE = "submitBatchScoreUpdate(address[],uint256[],uint256,uint256,uint256,bytes)"
+
+
+def encode_single_calldata(signed_update: Dict[str, Any]) -> str:
+    """ABI-encode a submitScoreUpdate call for a signed update"""
+    update = signed_update["update"]
+    return "0x" + encode_call(
+        SUBMIT_SCORE_UPDATE_SIGNATURE,
+        ["(address,uint256,uint256,uint256,uint256)", "bytes"],
+        [
+            (update["user"], update["score"], update["version"], update["nonce"], update["deadline"]),
+            bytes.fromhex(signed_update["signature"][2:])
+        ]
+    ).hex()
+
+
+def encode_batch_calldata(signed_batch: Dict[str, Any]) -> str:
+    """ABI-encode a submitBatchScoreUpdate call for a signed batch"""
+    update = signed_batch["update"]
+    return "0x" + encode_call(
+        SUBMIT_BATCH_SCORE_UPDATE_SIGNATURE,
+        ["address[]", "uint256[]", "uint256", "uint256", "uint256", "bytes"],
+        [
+            update["users"], update["scores"], update["version"],
+            update["nonce"], update["deadline"],
+            bytes.fromhex(signed_batch["signature"][2:])
+        ]
+    ).hex()
+
+
+def _export_line(signed: Dict[str, Any], mode: str, fmt: str) -> Dict[str, Any]:
+    update = signed["update"]
+    if fmt == "calldata":
+        data = encode_single_calldata(signed) if mode == "single" else encode_batch_calldata(signed)
+        return {"to": SCORE_ORACLE_ADDRESS, "data": data}
+
+    line = {**update, "signature": signed["signature"], "signer": signed["signer"]}
+    if mode == "batch":
+        line["submitter"] = signed["submitter"]
+    return line
+
+
+async def iter_export_updates(addresses: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Score addresses and yield their updates
+
+    Args:
+        addresses: Addresses to score
+
+    Yields:
+        {'user', 'score'} updates, or {'address', 'error'} for failed scores
+    """
+    async for result in iter_batch_scores(addresses):
+        if result.get("success"):
+            yield {"user": result["address"], "score": result["score"]}
+        else:
+            yield {"address": result["address"], "error": result.get("error")}
+
+
+async def _chunks(updates: AsyncIterator[Dict[str, Any]], size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    chunk = []
+    async for update in updates:
+        chunk.append(update)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def iter_signed_export(
+    updates: AsyncIterator[Dict[str, Any]],
+    mode: str = "single",
+    fmt: str = "jsonl",
+    submitter: Optional[str] = None,
+    version: int = 2,
+    deadline_minutes: int = 60
+) -> AsyncIterator[str]:
+    """
+    Sign score updates and stream them as export lines
+
+    Nonces are read fresh from the contract for each export and incremented
+    within it, so an export never consumes nonces of the oracle's own
+    submissions. In batch mode the batch nonces belong to the submitter
+    and the batches must be submitted in the order they are emitted.
+
+    Args:
+        updates: Async iterator of {'user', 'score'} dicts (or {'address', 'error'})
+        mode: "single" (submitScoreUpdate) or "batch" (submitBatchScoreUpdate)
+        fmt: "jsonl" (signed payloads) or "calldata" (ready-to-send transactions)
+        submitter: Account that will send batch transactions (required in batch mode)
+        version: Algorithm version
+        deadline_minutes: How many minutes until signatures expire
+
+    Yields:
+        Newline-terminated JSON lines
+    """
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"Invalid mode: {mode}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format: {fmt}")
+    if not oracle_service.signing_pipeline:
+        raise ValueError("Oracle service not properly initialized")
+    if mode == "batch" and not submitter:
+        raise ValueError("Batch export needs the submitter account")
+
+    pipeline = oracle_service.signing_pipeline
+    nonce_cache = OracleNonceCache(oracle_service.fetch_oracle_nonces)
+    if submitter:
+        submitter = Web3.to_checksum_address(submitter)
+    exported = 0
+
+    async for chunk in _chunks(updates, ORACLE_EXPORT_CHUNK_SIZE):
+        for failed in (update for update in chunk if "error" in update):
+            yield json.dumps(failed) + "\n"
+        scored = [update for update in chunk if "error" not in update]
+        if not scored:
+            continue
+
+        if mode == "single":
+            signed = await pipeline.sign_score_updates(scored, version, deadline_minutes, nonce_cache)
+        else:
+            batches = [scored[i:i + ORACLE_BATCH_SIZE] for i in range(0, len(scored), ORACLE_BATCH_SIZE)]
+            signed = await pipeline.sign_batch_updates(batches, submitter, version, deadline_minutes, nonce_cache)
+
+        for item in signed:
+            yield json.dumps(_export_line(item, mode, fmt)) + "\n"
+        exported += len(scored)
+
+    logger.info(f"Exported {exported} signed updates ({mode}, {fmt})")
@@ -0,0 +1,218 @@
+"""
+Score cache for reputation lookups
+In-memory LRU tier plus an optional SQLite tier, with TTL and
+stale-while-revalidate refreshes
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .concurrency import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Results younger than this are served as fresh
+SCORE_CACHE_TTL_SECONDS = float(os.getenv("SCORE_CACHE_TTL_SECONDS", "300"))
+# Results younger than this (but past the TTL) are served stale and refreshed in the background
+SCORE_CACHE_STALE_SECONDS = float(os.getenv("SCORE_CACHE_STALE_SECONDS", "3600"))
+# Maximum number of entries held in memory
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "10000"))
+# Optional SQLite file for a persistent tier shared across restarts and workers
+SCORE_CACHE_DB_PATH = os.getenv("SCORE_CACHE_DB_PATH", "")
+
+CacheKey = Tuple[str, str]
+
+
+class SQLiteScoreStore:
+    """Persistent score storage backed by a local SQLite file"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "address TEXT NOT NULL, model_version TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, result TEXT NOT NULL, "
+            "PRIMARY KEY (address, model_version))"
+        )
+        self._conn.commit()
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, stored_at FROM scores WHERE address = ? AND model_version = ?",
+                key
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: CacheKey, result: Dict[str, Any], stored_at: float):
+        payload = json.dumps(result)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (address, model_version, stored_at, result) VALUES (?, ?, ?, ?)",
+                (key[0], key[1], stored_at, payload)
+            )
+            self._conn.commit()
+
+    def purge_older_than(self, cutoff: float):
+        with self._lock:
+            self._conn.execute("DELETE FROM scores WHERE stored_at < ?", (cutoff,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ScoreCache:
+    """
+    Two-tier cache of score results keyed by (address, model version)
+
+    Lookups return one of three states:
+    - "hit":   entry younger than the TTL, served directly
+    - "stale": entry past the TTL but inside the stale window; served
+               immediately while a background task recomputes it
+    - "miss":  no usable entry; the score is computed inline
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SCORE_CACHE_TTL_SECONDS,
+        stale_seconds: float = SCORE_CACHE_STALE_SECONDS,
+        max_entries: int = SCORE_CACHE_MAX_ENTRIES,
+        db_path: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = max(stale_seconds, ttl_seconds)
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[CacheKey, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._store = SQLiteScoreStore(db_path) if db_path else None
+        if self._store is not None:
+            # Entries past the stale window can never be served again
+            self._store.purge_older_than(time.time() - self.stale_seconds)
+        self._refreshes = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(address: str, model_version: str) -> CacheKey:
+        return (address.lower(), model_version)
+
+    def _remember(self, key: CacheKey, result: Dict[str, Any], stored_at: float):
+        self._memory[key] = (result, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: CacheKey) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Look up an entry in memory, then in the persistent tier"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        if self._store is not None:
+            entry = await asyncio.to_thread(self._store.get, key)
+            if entry is not None:
+                self._remember(key, *entry)
+            return entry
+
+        return None
+
+    async def set(self, key: CacheKey, result: Dict[str, Any]):
+        """Store a result in both tiers"""
+        stored_at = time.time()
+        self._remember(key, result, stored_at)
+        if self._store is not None:
+            try:
+                await asyncio.to_thread(self._store.set, key, result, stored_at)
+            except Exception as e:
+                logger.warning(f"Error writing score cache entry: {str(e)}")
+
+    async def _compute_and_store(self, key: CacheKey, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        result = await compute()
+        if is_cacheable(result):
+            await self.set(key, result)
+        return result
+
+    def _refresh_in_background(self, key: CacheKey, compute: Callable[[], Awaitable[Dict[str, Any]]]):
+        """Recompute a stale entry without blocking the caller (one refresh per key)"""
+        async def refresh():
+            try:
+                await self._refreshes.do(key, lambda: self._compute_and_store(key, compute))
+            except Exception as e:
+                logger.warning(f"Background score refresh failed for {key[0]}: {str(e)}")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_compute(
+        self,
+        address: str,
+        model_version: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Serve a score from cache, computing or refreshing it as needed
+
+        Args:
+            address: Wallet address
+            model_version: Version of the scoring model in use
+            compute: Zero-argument coroutine factory that calculates the score
+
+        Returns:
+            Tuple of (score result, cache status: "hit", "stale" or "miss")
+        """
+        key = self.make_key(address, model_version)
+
+        try:
+            entry = await self.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading score cache: {str(e)}")
+            entry = None
+
+        if entry is not None:
+            result, stored_at = entry
+            age = time.time() - stored_at
+            if age <= self.ttl_seconds:
+                return result, "hit"
+            if age <= self.stale_seconds:
+                self._refresh_in_background(key, compute)
+                return result, "stale"
+
+        result = await self._refreshes.do(key, lambda: self._compute_and_store(key, compute))
+        return result, "miss"
+
+    async def close(self):
+        """Cancel pending refreshes and close the persistent tier"""
+        for task in list(self._background):
+            task.cancel()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """Error and demo fallbacks from calculate_score must not be cached"""
+    return (
+        isinstance(result, dict)
+        and not result.get("is_demo")
+        and "error" not in result.get("metrics", {})
+    )
+
+
+# Global score cache instance
+score_cache = ScoreCache(db_path=SCORE_CACHE_DB_PATH or None)
@@ -0,0 +1,100 @@
+"""
+Job handlers for background scoring and oracle submission
+"""
+
+import logging
+import os
+from typing import Any, Dict
+
+from .batch_scoring import iter_batch_scores
+from .job_queue import JobCheckpoint, JobQueue, NonRetryableJobError, ProgressReporter
+from .oracle_service import batch_submit_scores_to_oracle, oracle_service
+
+logger = logging.getLogger(__name__)
+
+SCORE_JOB = "score"
+
+# Maximum number of addresses accepted by a single scoring job
+JOB_MAX_ADDRESSES = int(os.getenv("JOB_MAX_ADDRESSES", "10000"))
+# Record progress after this many scored addresses
+JOB_PROGRESS_INTERVAL = int(os.getenv("JOB_PROGRESS_INTERVAL", "10"))
+
+
+async def run_score_job(payload: Dict[str, Any], report: ProgressReporter, checkpoint: JobCheckpoint) -> Dict[str, Any]:
+    """
+    Score a list of addresses and optionally submit the scores to the oracle
+
+    Each stage is checkpointed: a retried job reuses the scored results and
+    the oracle submission of earlier attempts. Scores are never submitted
+    twice; if an attempt stopped during the submission, the job fails.
+
+    Args:
+        payload: Dict with "addresses" and "submit_to_oracle"
+        report: Callback recording job progress
+        checkpoint: State saved by earlier attempts of the job
+
+    Returns:
+        Batch results in input order, plus the oracle submission result
+    """
+    addresses = payload["addresses"]
+    submit_to_oracle = payload.get("submit_to_oracle", False)
+    total = len(addresses)
+    results = checkpoint.state.get("results")
+
+    if results is None:
+        results = [None] * total
+        completed = 0
+        successful = 0
+
+        await report({"stage": "scoring", "completed": 0, "total": total, "successful": 0})
+
+        async for result in iter_batch_scores(addresses):
+            results[result.pop("index")] = result
+            completed += 1
+            if result.get("success"):
+                successful += 1
+            if completed % JOB_PROGRESS_INTERVAL == 0 or completed == total:
+                await report({"stage": "scoring", "completed": completed, "total": total, "successful": successful})
+
+        await checkpoint.save(results=results)
+    else:
+        completed = total
+        successful = sum(1 for r in results if r.get("success"))
+        logger.info(f"Resuming score job with {total} already scored addresses")
+
+    job_result = {
+        "total_addresses": total,
+        "successful_calculations": successful,
+        "results": results
+    }
+
+    oracle_updates = [
+        {"user": r["address"], "score": r["score"]}
+        for r in results if r.get("success")
+    ]
+    if submit_to_oracle and oracle_updates:
+        oracle_result = checkpoint.state.get("oracle_submission")
+        if oracle_result is None:
+            if checkpoint.state.get("oracle_submission_started"):
+                raise NonRetryableJobError(
+                    "A previous attempt stopped during the oracle submission; "
+                    "not resubmitting scores that may already be on chain"
+                )
+            await checkpoint.save(oracle_submission_started=True)
+            await report({"stage": "oracle_submission", "completed": completed, "total": total, "successful": successful})
+            oracle_result = await batch_submit_scores_to_oracle(oracle_updates)
+            await checkpoint.save(oracle_submission=oracle_result)
+        job_result["oracle_submission"] = oracle_result
+
+        # Jobs run in the background, so they can wait for the batches to be mined
+        tx_hashes = [b["transaction_hash"] for b in oracle_result.get("batches", []) if b.get("transaction_hash")]
+        if tx_hashes:
+            await report({"stage": "confirming", "completed": completed, "total": total, "successful": successful})
+            oracle_result["transactions"] = await oracle_service.wait_for_transactions(tx_hashes)
+
+    return job_result
+
+
+def register_scoring_jobs(queue: JobQueue):
+    """Register the scoring job handlers on a queue"""
+    queue.register(SCORE_JOB, run_score_job)
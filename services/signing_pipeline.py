@@ -0,0 +1,300 @@
+"""
+Bulk off-chain signing of ScoreOracle updates
+Oracle nonces are fetched for many users in one multicall and then
+incremented locally; ECDSA signing is spread across a process pool
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from eth_abi import encode as abi_encode
+from eth_keys import keys
+from eth_utils import keccak
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+# Signing processes (0 = one per CPU)
+ORACLE_SIGNING_WORKERS = int(os.getenv("ORACLE_SIGNING_WORKERS", "0"))
+# Digests signed per worker task; smaller jobs are signed in-process
+ORACLE_SIGNING_CHUNK_SIZE = int(os.getenv("ORACLE_SIGNING_CHUNK_SIZE", "256"))
+# How long a locally tracked oracle nonce is trusted before re-reading it
+ORACLE_NONCE_CACHE_TTL_SECONDS = float(os.getenv("ORACLE_NONCE_CACHE_TTL_SECONDS", "300"))
+
+ETH_SIGNED_MESSAGE_PREFIX = b"\x19Ethereum Signed Message:\n32"
+
+
+def _uint256(value: int) -> bytes:
+    return int(value).to_bytes(32, "big")
+
+
+def _address_bytes(address: str) -> bytes:
+    raw = bytes.fromhex(address[2:] if address.startswith("0x") else address)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address: {address}")
+    return raw
+
+
+def score_update_digest(user: str, score: int, version: int, nonce: int, deadline: int) -> bytes:
+    """Hash a single update exactly like ScoreOracle._verifyScoreUpdateSignature"""
+    return keccak(
+        b"ScoreUpdate" + _address_bytes(user)
+        + _uint256(score) + _uint256(version) + _uint256(nonce) + _uint256(deadline)
+    )
+
+
+def batch_update_digest(users: List[str], scores: List[int], version: int, batch_nonce: int, deadline: int) -> bytes:
+    """Hash a batch update exactly like ScoreOracle._verifyBatchUpdateSignature"""
+    # abi.encodePacked(address[]) pads every element to 32 bytes
+    users_hash = keccak(b"".join(_address_bytes(user).rjust(32, b"\0") for user in users))
+    scores_hash = keccak(abi_encode(['uint256[]'], [[int(score) for score in scores]]))
+    return keccak(
+        b"BatchScoreUpdate" + users_hash + scores_hash
+        + _uint256(version) + _uint256(batch_nonce) + _uint256(deadline)
+    )
+
+
+def _sign_with_key(private_key: keys.PrivateKey, digests: List[bytes]) -> List[str]:
+    """Sign digests as eth_sign messages (toEthSignedMessageHash), returning 0x-hex signatures"""
+    signatures = []
+    for digest in digests:
+        signature = private_key.sign_msg_hash(keccak(ETH_SIGNED_MESSAGE_PREFIX + digest))
+        signatures.append("0x" + (_uint256(signature.r) + _uint256(signature.s) + bytes([signature.v + 27])).hex())
+    return signatures
+
+
+# Key held by each signing process, set by the pool initializer
+_worker_key: Optional[keys.PrivateKey] = None
+
+
+def _init_worker(private_key: bytes):
+    global _worker_key
+    _worker_key = keys.PrivateKey(private_key)
+
+
+def _sign_in_worker(digests: List[bytes]) -> List[str]:
+    return _sign_with_key(_worker_key, digests)
+
+
+class OracleNonceCache:
+    """
+    Oracle nonces per user, fetched in bulk and then incremented locally
+
+    reserve() hands out the next nonce for each user (consecutive nonces if
+    a user appears more than once), so many updates can be signed without
+    an RPC call per user.
+    """
+
+    def __init__(
+        self,
+        fetch_nonces: Callable[[List[str]], Awaitable[List[int]]],
+        ttl_seconds: float = ORACLE_NONCE_CACHE_TTL_SECONDS
+    ):
+        self._fetch_nonces = fetch_nonces
+        self.ttl_seconds = ttl_seconds
+        self._nonces: Dict[str, Tuple[int, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def reserve(self, users: List[str]) -> List[int]:
+        """
+        Reserve one oracle nonce per entry in users
+
+        Args:
+            users: Checksummed user addresses (duplicates allowed)
+
+        Returns:
+            Nonces in the same order
+        """
+        async with self._lock:
+            now = time.time()
+            missing = list(dict.fromkeys(
+                user for user in users
+                if user not in self._nonces or now - self._nonces[user][1] > self.ttl_seconds
+            ))
+            if missing:
+                for user, nonce in zip(missing, await self._fetch_nonces(missing)):
+                    self._nonces[user] = (nonce, now)
+
+            reserved = []
+            for user in users:
+                nonce, fetched_at = self._nonces[user]
+                reserved.append(nonce)
+                self._nonces[user] = (nonce + 1, fetched_at)
+            return reserved
+
+    def invalidate(self, users: Optional[List[str]] = None):
+        """Forget cached nonces (all of them if users is None)"""
+        if users is None:
+            self._nonces.clear()
+            return
+        for user in users:
+            self._nonces.pop(user, None)
+
+
+class SigningPipeline:
+    """
+    Signs large numbers of oracle updates off-chain
+
+    Nonces come from an OracleNonceCache and signatures are produced across a
+    pool of processes (ECDSA in eth_keys is CPU-bound and holds the GIL).
+    """
+
+    def __init__(
+        self,
+        private_key: bytes,
+        fetch_nonces: Callable[[List[str]], Awaitable[List[int]]],
+        workers: int = ORACLE_SIGNING_WORKERS,
+        chunk_size: int = ORACLE_SIGNING_CHUNK_SIZE
+    ):
+        self._private_key = keys.PrivateKey(private_key)
+        self.signer = self._private_key.public_key.to_checksum_address()
+        self.nonce_cache = OracleNonceCache(fetch_nonces)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._private_key.to_bytes(),)
+            )
+            logger.info(f"Signing pool started with {self.workers} processes")
+        return self._executor
+
+    async def sign_digests(self, digests: List[bytes]) -> List[str]:
+        """
+        Sign message digests as eth_sign signatures
+
+        Args:
+            digests: 32-byte message hashes
+
+        Returns:
+            0x-prefixed 65-byte signatures in the same order
+        """
+        if len(digests) <= self.chunk_size:
+            # Not worth a round trip to the pool, but keep it off the event loop
+            return await asyncio.to_thread(_sign_with_key, self._private_key, digests)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunks = [digests[i:i + self.chunk_size] for i in range(0, len(digests), self.chunk_size)]
+        signed_chunks = await asyncio.gather(*[
+            loop.run_in_executor(executor, _sign_in_worker, chunk) for chunk in chunks
+        ])
+        return [signature for chunk in signed_chunks for signature in chunk]
+
+    async def sign_score_updates(
+        self,
+        updates: List[Dict[str, Any]],
+        version: int = 2,
+        deadline_minutes: int = 60,
+        nonce_cache: Optional[OracleNonceCache] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sign single score updates for many users
+
+        Args:
+            updates: List of dicts with 'user' and 'score' keys
+            version: Algorithm version
+            deadline_minutes: How many minutes until signatures expire
+            nonce_cache: Nonce source to reserve from (defaults to the shared cache)
+
+        Returns:
+            Signed updates in the format returned by OracleService.sign_score_update
+        """
+        users = [Web3.to_checksum_address(update["user"]) for update in updates]
+        scores = [int(update["score"]) for update in updates]
+        nonces = await (nonce_cache or self.nonce_cache).reserve(users)
+        deadline = int(datetime.now(timezone.utc).timestamp()) + (deadline_minutes * 60)
+
+        digests = [
+            score_update_digest(user, score, version, nonce, deadline)
+            for user, score, nonce in zip(users, scores, nonces)
+        ]
+        signatures = await self.sign_digests(digests)
+
+        return [
+            {
+                "update": {
+                    "user": user,
+                    "score": score,
+                    "version": version,
+                    "nonce": nonce,
+                    "deadline": deadline
+                },
+                "signature": signature,
+                "signer": self.signer
+            }
+            for user, score, nonce, signature in zip(users, scores, nonces, signatures)
+        ]
+
+    async def sign_batch_updates(
+        self,
+        batches: List[List[Dict[str, Any]]],
+        submitter: str,
+        version: int = 2,
+        deadline_minutes: int = 60,
+        nonce_cache: Optional[OracleNonceCache] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sign several submitBatchScoreUpdate payloads at once
+
+        The contract checks each batch nonce against nonces[msg.sender], so
+        nonces are reserved for the account that will submit the batches and
+        the batches must be submitted in the returned order.
+
+        Args:
+            batches: Lists of dicts with 'user' and 'score' keys (at most 100 each)
+            submitter: Address that will send the batch transactions
+            version: Algorithm version
+            deadline_minutes: How many minutes until signatures expire
+            nonce_cache: Nonce source to reserve from (defaults to the shared cache)
+
+        Returns:
+            Signed batches in the format returned by OracleService.sign_batch_score_update
+        """
+        submitter = Web3.to_checksum_address(submitter)
+        batch_nonces = await (nonce_cache or self.nonce_cache).reserve([submitter] * len(batches))
+        deadline = int(datetime.now(timezone.utc).timestamp()) + (deadline_minutes * 60)
+
+        payloads = []
+        for batch, batch_nonce in zip(batches, batch_nonces):
+            users = [Web3.to_checksum_address(update["user"]) for update in batch]
+            scores = [int(update["score"]) for update in batch]
+            payloads.append((users, scores, batch_nonce))
+
+        signatures = await self.sign_digests([
+            batch_update_digest(users, scores, version, batch_nonce, deadline)
+            for users, scores, batch_nonce in payloads
+        ])
+
+        return [
+            {
+                "update": {
+                    "users": users,
+                    "scores": scores,
+                    "version": version,
+                    "nonce": batch_nonce,
+                    "deadline": deadline
+                },
+                "signature": signature,
+                "signer": self.signer,
+                "submitter": submitter
+            }
+            for (users, scores, batch_nonce), signature in zip(payloads, signatures)
+        ]
+
+    def close(self):
+        """Shut down the signing processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
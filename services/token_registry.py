@@ -0,0 +1,139 @@
+"""
+Token metadata registry
+Caches immutable ERC-20 metadata (decimals, symbol) for the process lifetime
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from web3 import AsyncWeb3
+
+from .multicall import batch_call, token_decimals_read
+
+logger = logging.getLogger(__name__)
+
+# Optional JSON file used to persist metadata across restarts
+TOKEN_METADATA_CACHE_PATH = os.getenv("TOKEN_METADATA_CACHE_PATH", "")
+
+
+def token_symbol_read(token: str):
+    """Read ERC-20 symbol"""
+    return (token, "symbol()", [], [], ["string"])
+
+
+class TokenRegistry:
+    """
+    Registry of ERC-20 token metadata
+
+    Decimals and symbols never change for a deployed token, so each token is
+    looked up on-chain at most once per process (or never, when a persisted
+    cache file is available).
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._load_cache()
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _load_cache(self):
+        """Load persisted metadata from disk if a cache file is configured"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            for address, metadata in data.items():
+                if metadata.get("decimals") is not None:
+                    self._tokens[address.lower()] = metadata
+            logger.info(f"Loaded metadata for {len(self._tokens)} tokens from {self.cache_path}")
+        except Exception as e:
+            logger.warning(f"Error loading token metadata cache: {str(e)}")
+
+    def _save_cache(self):
+        """Persist metadata to disk if a cache file is configured"""
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._tokens, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Error saving token metadata cache: {str(e)}")
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get cached metadata for a token without touching the network"""
+        return self._tokens.get(token.lower())
+
+    async def get_many(self, aw3: AsyncWeb3, tokens: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for several tokens, fetching unknown ones via Multicall3
+
+        Args:
+            aw3: Async Web3 instance for the chain the tokens live on
+            tokens: Token contract addresses
+
+        Returns:
+            Mapping of token address -> {"address", "symbol", "decimals"}
+            (tokens whose metadata could not be read are omitted)
+        """
+        tokens = list(tokens)
+        missing = [token for token in tokens if token.lower() not in self._tokens]
+
+        if missing:
+            async with self._get_lock():
+                # Another coroutine may have fetched them while we waited
+                missing = [token for token in missing if token.lower() not in self._tokens]
+                if missing:
+                    await self._fetch(aw3, missing)
+
+        return {
+            token: self._tokens[token.lower()]
+            for token in tokens
+            if token.lower() in self._tokens
+        }
+
+    async def warm(self, aw3: AsyncWeb3, tokens: Iterable[str]):
+        """Pre-load metadata for a token list (e.g. at application startup)"""
+        tokens = list(tokens)
+        loaded = await self.get_many(aw3, tokens)
+        logger.info(f"Token registry warmed: {len(loaded)}/{len(tokens)} tokens")
+
+    async def _fetch(self, aw3: AsyncWeb3, tokens: list):
+        reads = [token_decimals_read(token) for token in tokens]
+        reads += [token_symbol_read(token) for token in tokens]
+        values = await batch_call(aw3, reads)
+
+        decimals = values[:len(tokens)]
+        symbols = values[len(tokens):]
+
+        added = 0
+        for token, token_decimals, symbol in zip(tokens, decimals, symbols):
+            if token_decimals is None:
+                logger.warning(f"Unable to read decimals for token {token}")
+                continue
+            self._tokens[token.lower()] = {
+                "address": token,
+                "symbol": symbol,
+                "decimals": int(token_decimals)
+            }
+            added += 1
+
+        if added:
+            self._save_cache()
+
+
+# Global registry for Ethereum mainnet tokens
+token_registry = TokenRegistry(cache_path=TOKEN_METADATA_CACHE_PATH or None)
@@ -0,0 +1,277 @@
+"""
+Streaming transaction history from Etherscan
+Pages through the full txlist of an address and reduces it incrementally,
+so memory stays flat regardless of how many transactions a wallet has
+"""
+
+import logging
+import os
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .etherscan import etherscan_get
+
+logger = logging.getLogger(__name__)
+
+# Etherscan rejects queries where page * offset exceeds this many records
+ETHERSCAN_RESULT_WINDOW = 10000
+
+# txlist pagination
+ETHERSCAN_PAGE_SIZE = int(os.getenv("ETHERSCAN_PAGE_SIZE", "1000"))
+# Page budget per address (0 = unlimited)
+ETHERSCAN_MAX_PAGES = int(os.getenv("ETHERSCAN_MAX_PAGES", "50"))
+
+# Number of most recent transactions kept for recency-based metrics
+RECENT_WINDOW = 50
+
+
+class TransactionHistoryError(Exception):
+    """Raised when the explorer API fails before any history was read"""
+
+
+def _parse_txlist_response(data: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Return the transactions in a txlist response, [] for no results, None on error"""
+    if data is None:
+        return None
+    result = data.get("result")
+    if data.get("status") == "1" and isinstance(result, list):
+        return result
+    if data.get("message") == "No transactions found":
+        return []
+    return None
+
+
+async def _fetch_newest_transactions(
+    client: httpx.AsyncClient,
+    address: str,
+    endblock: int
+) -> Optional[List[Dict[str, Any]]]:
+    """The newest RECENT_WINDOW transactions up to endblock, newest first (None on error)"""
+    return _parse_txlist_response(await etherscan_get(client, {
+        "module": "account",
+        "action": "txlist",
+        "address": address,
+        "startblock": 0,
+        "endblock": endblock,
+        "page": 1,
+        "offset": RECENT_WINDOW,
+        "sort": "desc"
+    }))
+
+
+async def iter_transaction_pages(
+    client: httpx.AsyncClient,
+    address: str,
+    endblock: int = 99999999,
+    max_pages: int = ETHERSCAN_MAX_PAGES,
+    status: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream the txlist of an address page by page, oldest first
+
+    Etherscan only serves the first 10,000 records of a query, so once a
+    block window is exhausted the query restarts from the last block seen;
+    transactions from that boundary block are de-duplicated by hash.
+
+    Args:
+        client: HTTP client for making requests
+        address: Wallet address to analyze
+        endblock: Last block to include
+        max_pages: Maximum number of pages to fetch (0 = unlimited)
+        status: Optional dict; "truncated" is set to True if the page budget
+            ran out (or a later page failed) before the end of the history.
+            A history ending exactly on the last budgeted page is complete.
+            When the budget runs out, "newest" holds the newest transactions
+            (descending, None on error) fetched for that check
+
+    Yields:
+        Lists of transactions in ascending block order
+
+    Raises:
+        TransactionHistoryError: If the very first page cannot be fetched
+    """
+    pages_per_window = max(1, ETHERSCAN_RESULT_WINDOW // ETHERSCAN_PAGE_SIZE)
+    startblock = 0
+    page = 1
+    pages_fetched = 0
+    boundary_hashes = set()
+    last_hash = None
+
+    while True:
+        if max_pages and pages_fetched >= max_pages:
+            # Out of page budget after a full page: unless that page ended
+            # with the newest transaction, there is more history left to read
+            if status is not None:
+                newest = await _fetch_newest_transactions(client, address, endblock)
+                status["newest"] = newest
+                if not newest or last_hash is None or newest[0].get("hash") != last_hash:
+                    status["truncated"] = True
+            return
+
+        params = {
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "startblock": startblock,
+            "endblock": endblock,
+            "page": page,
+            "offset": ETHERSCAN_PAGE_SIZE,
+            "sort": "asc"
+        }
+
+        transactions = _parse_txlist_response(await etherscan_get(client, params))
+        pages_fetched += 1
+
+        if transactions is None:
+            if pages_fetched == 1:
+                raise TransactionHistoryError(f"Etherscan txlist failed for {address}")
+            logger.warning(f"Etherscan txlist failed mid-stream for {address}, history is partial")
+            if status is not None:
+                status["truncated"] = True
+            return
+
+        page_transactions = transactions
+        full_page = len(page_transactions) >= ETHERSCAN_PAGE_SIZE
+        if page_transactions:
+            last_hash = page_transactions[-1].get("hash")
+
+        if boundary_hashes:
+            transactions = [tx for tx in transactions if tx.get("hash") not in boundary_hashes]
+            boundary_hashes = set()
+
+        if transactions:
+            yield transactions
+
+        if not full_page:
+            return
+        if page < pages_per_window:
+            page += 1
+            continue
+
+        # Result window exhausted: restart from the last block we saw
+        last_block = int(page_transactions[-1].get("blockNumber", 0))
+        if last_block <= startblock:
+            logger.warning(f"More than {ETHERSCAN_RESULT_WINDOW} txs in block {last_block} for {address}, stopping")
+            return
+        boundary_hashes = {
+            tx.get("hash") for tx in page_transactions
+            if int(tx.get("blockNumber", 0)) == last_block
+        }
+        startblock = last_block
+        page = 1
+
+
+class TransactionSummary:
+    """
+    Incremental reduction of a transaction history
+
+    Tracks count, first/last timestamps, value statistics and a bounded
+    window of the most recent transactions without keeping the full list.
+    """
+
+    def __init__(self, address: str):
+        self.address = address.lower()
+        self.transaction_count = 0
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+        self.total_value_wei = 0
+        self.max_value_wei = 0
+        self.complete = True
+        self._recent = deque(maxlen=RECENT_WINDOW)
+
+    def add(self, transactions: List[Dict[str, Any]]):
+        """Fold a page of transactions (ascending order) into the summary"""
+        for tx in transactions:
+            timestamp = int(tx.get("timeStamp", 0))
+            value = int(tx.get("value", 0))
+
+            self.transaction_count += 1
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self.last_timestamp = timestamp
+
+            self.total_value_wei += value
+            self.max_value_wei = max(self.max_value_wei, value)
+
+            self._recent.append({
+                "hash": tx.get("hash"),
+                "from": tx.get("from", ""),
+                "to": tx.get("to", ""),
+                "value": tx.get("value", "0"),
+                "timeStamp": tx.get("timeStamp", "0")
+            })
+
+    def replace_recent(self, transactions: List[Dict[str, Any]]):
+        """Replace the recent window with the newest transactions (descending order)"""
+        self._recent.clear()
+        for tx in reversed(transactions[:RECENT_WINDOW]):
+            self._recent.append(tx)
+        if transactions:
+            self.last_timestamp = max(self.last_timestamp or 0, int(transactions[0].get("timeStamp", 0)))
+
+    def recent_transactions(self) -> List[Dict[str, Any]]:
+        """Most recent transactions, newest first"""
+        return list(reversed(self._recent))
+
+    def to_metrics(self) -> Dict[str, Any]:
+        """Transaction metrics in the shape used by calculate_score"""
+        average_value_wei = self.total_value_wei / self.transaction_count if self.transaction_count else 0
+        return {
+            "transaction_count": self.transaction_count,
+            "first_transaction_timestamp": self.first_timestamp,
+            "last_transaction_timestamp": self.last_timestamp,
+            "total_value_transferred_eth": round(self.total_value_wei / 1e18, 6),
+            "avg_transaction_value_eth": round(average_value_wei / 1e18, 6),
+            "max_transaction_value_eth": round(self.max_value_wei / 1e18, 6),
+            "transaction_history_complete": self.complete
+        }
+
+
+async def fetch_transaction_summary(
+    client: httpx.AsyncClient,
+    address: str,
+    endblock: int = 99999999,
+    max_pages: int = ETHERSCAN_MAX_PAGES
+) -> Optional[TransactionSummary]:
+    """
+    Stream an address's full transaction history into a TransactionSummary
+
+    When the page budget runs out before the end of the history, the newest
+    transactions are fetched separately so recency metrics stay accurate.
+
+    Args:
+        client: HTTP client for making requests
+        address: Wallet address to analyze
+        endblock: Last block to include (the snapshot block for consistency)
+        max_pages: Maximum number of pages to fetch (0 = unlimited)
+
+    Returns:
+        TransactionSummary, or None if the explorer API failed
+    """
+    summary = TransactionSummary(address)
+    status = {"truncated": False}
+
+    try:
+        async for transactions in iter_transaction_pages(client, address, endblock, max_pages, status):
+            summary.add(transactions)
+    except TransactionHistoryError as e:
+        logger.warning(str(e))
+        return None
+
+    if status["truncated"]:
+        summary.complete = False
+        logger.info(f"Page budget reached for {address} after {summary.transaction_count} txs")
+        # Reuse the newest page fetched by the completeness check, if any
+        if "newest" in status:
+            newest = status["newest"]
+        else:
+            newest = await _fetch_newest_transactions(client, address, endblock)
+        if newest:
+            summary.replace_recent(newest)
+        elif newest is None:
+            # The ascending stream stopped early, so its recent window is out of date
+            logger.warning(f"Could not fetch the newest transactions of {address}, recency metrics may be stale")
+
+    return summary
@@ -6,7 +6,7 @@ Run this to initialize and train the machine learning models
 
 import os
 import sys
-import asyncio
+import argparse
 import logging
 from pathlib import Path
 
@@ -22,21 +22,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the Credo ML models")
+    parser.add_argument("--samples", type=int, default=10000, help="Synthetic training rows")
+    parser.add_argument("--workers", type=int, default=None, help="Training processes (0 = one per model, 1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per training chunk")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore existing per-model checkpoints")
+    return parser.parse_args()
+
+def main():
     """
     Main training function
     """
+    args = parse_args()
     logger.info("Starting Credo ML model training...")
     
     # Create models directory if it doesn't exist
     os.makedirs('models', exist_ok=True)
     
     try:
-        # Initialize and train models
-        await initialize_ml_models()
+        # Initialize and train models (synchronous, fitted across a process pool)
+        initialize_ml_models(
+            n_samples=args.samples,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            resume=not args.no_resume
+        )
         
         logger.info("✅ ML model training completed successfully!")
         logger.info("Models saved to: models/credo_ml_models.joblib")
+        logger.info("Compiled model saved to: models/credo_compiled")
         
         # Test the models with a sample
         logger.info("Testing trained models...")
@@ -80,4 +95,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file